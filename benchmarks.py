@@ -0,0 +1,318 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import tracemalloc
+from fractions import Fraction
+from time import perf_counter
+
+import main as calculadora
+
+
+######################################################
+############### Generadores de Matrices ##############
+######################################################
+
+TAMANOS = (4, 8, 16, 32, 64)
+TIPOS = ("enteros_pequenos", "enteros_grandes", "decimales", "racionales", "dispersa", "mal_condicionada")
+
+# Más allá de este tamaño la expansión por cofactores (O(n!)) tarda minutos
+TAMANO_MAXIMO_COFACTORES = 7
+# Escalera propia de los determinantes: la curva factorial solo se ve con varios tamaños pequeños, y
+# Bareiss se mide en los mismos puntos para poder comparar ambas curvas
+TAMANOS_COFACTORES = tuple(range(2, TAMANO_MAXIMO_COFACTORES + 1))
+TAMANOS_DETERMINANTE = TAMANOS_COFACTORES + tuple(n for n in TAMANOS if n > TAMANO_MAXIMO_COFACTORES)
+# Cantidad de matrices que se suman en la medición de acumular_matrices
+OPERANDOS_ACUMULACION = 8
+
+
+def _entrada(generador, tipo):
+    if tipo == "enteros_pequenos":
+        return Fraction(generador.randint(-9, 9))
+    elif tipo == "enteros_grandes":
+        return Fraction(generador.randint(-10 ** 18, 10 ** 18))
+    elif tipo == "decimales":
+        return Fraction(generador.randint(-99999, 99999), 1000)
+    else:
+        return Fraction(generador.randint(-50, 50), generador.randint(1, 50))
+
+
+def generar_datos(tipo, filas, columnas, semilla):
+    generador = random.Random(f"{semilla}:{tipo}:{filas}x{columnas}")
+
+    if tipo == "mal_condicionada":
+        # Matriz de Hilbert, con una columna extra de enteros si se pide una aumentada
+        return [[Fraction(1, i + j + 1) if j < filas else Fraction(generador.randint(-9, 9))
+                 for j in range(columnas)] for i in range(filas)]
+
+    if tipo == "dispersa":
+        # Unas tres entradas por fila y diagonal dominante para que sea invertible
+        datos = [[Fraction(0)] * columnas for _ in range(filas)]
+        for i in range(filas):
+            for j in generador.sample(range(columnas), min(3, columnas)):
+                datos[i][j] = Fraction(generador.randint(-9, 9))
+            if i < columnas:
+                datos[i][i] = Fraction(10 * columnas)
+        return datos
+
+    return [[_entrada(generador, tipo) for _ in range(columnas)] for _ in range(filas)]
+
+
+def generar_matriz(tipo, filas, columnas, semilla):
+    matriz = calculadora.nueva_matriz(filas, columnas, generar_datos(tipo, filas, columnas, semilla))
+    if tipo == "dispersa":
+        return calculadora.a_dispersa(matriz)
+    return matriz
+
+
+######################################################
+############### Operaciones a Medir ##################
+######################################################
+
+def _preparar_suma(tipo, n, semilla):
+    a = generar_matriz(tipo, n, n, semilla)
+    b = generar_matriz(tipo, n, n, semilla + 1)
+    return lambda backend: calculadora.sumar_matrices(a, b, backend)
+
+
+def _preparar_resta(tipo, n, semilla):
+    a = generar_matriz(tipo, n, n, semilla)
+    b = generar_matriz(tipo, n, n, semilla + 1)
+    return lambda backend: calculadora.restar_matrices(a, b, backend)
+
+
+def _preparar_acumulacion(tipo, n, semilla):
+    operandos = [generar_matriz(tipo, n, n, semilla + i) for i in range(OPERANDOS_ACUMULACION)]
+    return lambda backend: calculadora.acumular_matrices(operandos, "suma", backend)
+
+
+def _preparar_escalar(tipo, n, semilla):
+    a = generar_matriz(tipo, n, n, semilla)
+    escalar = Fraction(-7, 3)
+    return lambda backend: calculadora.multiplicar_matrices_escalar(a, escalar, backend)
+
+
+def _preparar_multiplicacion(tipo, n, semilla):
+    a = generar_matriz(tipo, n, n, semilla)
+    b = generar_matriz(tipo, n, n, semilla + 1)
+    return lambda backend: calculadora.multiplicar_matrices(a, b, backend)
+
+
+def _preparar_determinante(metodo):
+    def preparar(tipo, n, semilla):
+        if metodo == "explicar" and n > TAMANO_MAXIMO_COFACTORES:
+            return None
+        a = generar_matriz(tipo, n, n, semilla)
+        return lambda backend: calculadora.calcular_determinante(a, metodo, backend)
+    return preparar
+
+
+def _preparar_inversa(metodo):
+    def preparar(tipo, n, semilla):
+        a = generar_matriz(tipo, n, n, semilla)
+        return lambda backend: calculadora.calcular_inversa(a, metodo, backend=backend)
+    return preparar
+
+
+def _preparar_gauss_jordan(tipo, n, semilla):
+    a = generar_matriz(tipo, n, n + 1, semilla)
+    return lambda backend: calculadora.eliminar_gauss_jordan(a)
+
+
+def _preparar_analisis(tipo, n, semilla):
+    # Sistema subdeterminado: la mitad de las ecuaciones con el doble de incógnitas
+    a = generar_matriz(tipo, max(n // 2, 1), n + 1, semilla)
+    return lambda backend: calculadora.analizar_sistema(a)
+
+
+def _preparar_cramer(tipo, n, semilla):
+    a = generar_matriz(tipo, n, n + 1, semilla)
+    return lambda backend: calculadora.resolver_cramer(a, backend=backend)
+
+
+# nombre: (preparar, acepta backend, tamaños por omisión o None para usar TAMANOS)
+OPERACIONES = {
+    "suma": (_preparar_suma, True, None),
+    "resta": (_preparar_resta, True, None),
+    "acumulacion": (_preparar_acumulacion, True, None),
+    "escalar": (_preparar_escalar, True, None),
+    "multiplicacion": (_preparar_multiplicacion, True, None),
+    "determinante-auto": (_preparar_determinante("auto"), True, TAMANOS_DETERMINANTE),
+    "determinante-bareiss": (_preparar_determinante("bareiss"), True, TAMANOS_DETERMINANTE),
+    "determinante-cofactores": (_preparar_determinante("explicar"), False, TAMANOS_COFACTORES),
+    "inversa-adjuncion": (_preparar_inversa("adjuncion"), True, None),
+    "inversa-gauss-jordan": (_preparar_inversa("gauss-jordan"), False, None),
+    "gauss-jordan": (_preparar_gauss_jordan, False, None),
+    "analizar-sistema": (_preparar_analisis, False, None),
+    "cramer": (_preparar_cramer, True, None),
+}
+
+
+def _backends_disponibles():
+    backends = ["fraccion", "modular"]
+    if calculadora.np is not None:
+        backends.append("numpy")
+    return backends
+
+
+######################################################
+################### Medición #########################
+######################################################
+
+def medir(funcion, backend, repeticiones):
+    # El tiempo es el mínimo de varias repeticiones; la memoria se mide aparte porque tracemalloc
+    # ralentiza la ejecución
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = perf_counter()
+        funcion(backend)
+        tiempos.append(perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        funcion(backend)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(tiempos), pico
+
+
+def ejecutar_benchmarks(operaciones=None, tipos=None, tamanos=None, backends=None, semilla=0,
+                        repeticiones=3, salida=print):
+    operaciones = operaciones or list(OPERACIONES)
+    tipos = tipos or list(TIPOS)
+    backends = backends or _backends_disponibles()
+
+    # Con la caché activa solo la primera repetición haría trabajo real
+    calculadora.configurar_cache(activa=False)
+
+    resultados = []
+    for operacion in operaciones:
+        if operacion not in OPERACIONES:
+            raise ValueError(f"Operación no reconocida: {operacion}")
+        preparar, acepta_backend, tamanos_operacion = OPERACIONES[operacion]
+        for backend in backends:
+            if backend != "fraccion" and not acepta_backend:
+                continue
+            for tipo in tipos:
+                for n in tamanos or tamanos_operacion or TAMANOS:
+                    funcion = preparar(tipo, n, semilla)
+                    if funcion is None:
+                        continue
+                    resultado = {'operacion': operacion, 'backend': backend, 'tipo': tipo, 'n': n}
+                    try:
+                        resultado['tiempo'], resultado['memoria_pico'] = medir(funcion, backend, repeticiones)
+                    except (ValueError, ZeroDivisionError) as e:
+                        resultado['error'] = str(e)
+                    resultados.append(resultado)
+                    if 'error' in resultado:
+                        salida(f"{operacion:<24} {backend:<9} {tipo:<17} n={n:<4} error: {resultado['error']}")
+                    else:
+                        salida(f"{operacion:<24} {backend:<9} {tipo:<17} n={n:<4} "
+                               f"{resultado['tiempo'] * 1000:>11.3f} ms {resultado['memoria_pico'] / 1024:>11.1f} KB")
+
+    return {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'semilla': semilla,
+        'repeticiones': repeticiones,
+        'resultados': resultados
+    }
+
+
+######################################################
+################ Comparación de Líneas Base ##########
+######################################################
+
+def _clave_resultado(resultado):
+    return resultado['operacion'], resultado['backend'], resultado['tipo'], resultado['n']
+
+
+def comparar_resultados(base, actual, umbral=0.10, umbral_memoria=0.20):
+    # Devuelve las filas cuyo tiempo o pico de memoria creció más que su umbral relativo
+    anteriores = {_clave_resultado(r): r for r in base['resultados'] if 'tiempo' in r}
+    regresiones = []
+    for resultado in actual['resultados']:
+        anterior = anteriores.get(_clave_resultado(resultado))
+        if anterior is None:
+            continue
+        for medida, limite in (("tiempo", umbral), ("memoria_pico", umbral_memoria)):
+            if not anterior.get(medida) or medida not in resultado:
+                continue
+            razon = resultado[medida] / anterior[medida]
+            if razon > 1 + limite:
+                regresiones.append({
+                    'operacion': resultado['operacion'],
+                    'backend': resultado['backend'],
+                    'tipo': resultado['tipo'],
+                    'n': resultado['n'],
+                    'medida': medida,
+                    'base': anterior[medida],
+                    'actual': resultado[medida],
+                    'razon': razon
+                })
+    return regresiones
+
+
+def _leer_json(ruta):
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def _lista(texto, convertir=str):
+    return [convertir(x) for x in texto.split(",")] if texto else None
+
+
+def ejecutar_desde_linea_de_comandos(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de la Calculadora de Álgebra Lineal")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    ejecutar = subcomandos.add_parser("ejecutar", help="mide las operaciones y guarda una línea base JSON")
+    ejecutar.add_argument("--salida", metavar="ARCHIVO", help="archivo JSON donde guardar los resultados")
+    ejecutar.add_argument("--operaciones", help=f"lista separada por comas de: {', '.join(OPERACIONES)}")
+    ejecutar.add_argument("--tipos", help=f"lista separada por comas de: {', '.join(TIPOS)}")
+    ejecutar.add_argument("--tamanos", help="lista separada por comas de tamaños n (por omisión cada operación usa "
+                                           "su propia escalera)")
+    ejecutar.add_argument("--backends", help="lista separada por comas de backends")
+    ejecutar.add_argument("--semilla", type=int, default=0)
+    ejecutar.add_argument("--repeticiones", type=int, default=3)
+
+    comparar = subcomandos.add_parser("comparar", help="compara dos líneas base y señala regresiones")
+    comparar.add_argument("base", help="archivo JSON de referencia")
+    comparar.add_argument("actual", help="archivo JSON a evaluar")
+    comparar.add_argument("--umbral", type=float, default=0.10,
+                          help="aumento relativo de tiempo considerado regresión (0.10 = 10%%)")
+    comparar.add_argument("--umbral-memoria", type=float, default=0.20,
+                          help="aumento relativo del pico de memoria considerado regresión (0.20 = 20%%)")
+
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.comando == "ejecutar":
+        informe = ejecutar_benchmarks(_lista(opciones.operaciones), _lista(opciones.tipos),
+                                      _lista(opciones.tamanos, int), _lista(opciones.backends),
+                                      opciones.semilla, opciones.repeticiones)
+        if opciones.salida:
+            with open(opciones.salida, "w", encoding="utf-8") as archivo:
+                json.dump(informe, archivo, indent=2, ensure_ascii=False)
+            print(f"Resultados guardados en {opciones.salida}")
+        return 0
+
+    regresiones = comparar_resultados(_leer_json(opciones.base), _leer_json(opciones.actual), opciones.umbral,
+                                      opciones.umbral_memoria)
+    for r in regresiones:
+        if r['medida'] == "tiempo":
+            cambio = f"{r['base'] * 1000:.3f} ms -> {r['actual'] * 1000:.3f} ms"
+        else:
+            cambio = f"{r['base'] / 1024:.1f} KB -> {r['actual'] / 1024:.1f} KB"
+        print(f"{r['operacion']:<24} {r['backend']:<9} {r['tipo']:<17} n={r['n']:<4} {cambio} (x{r['razon']:.2f})")
+    if regresiones:
+        print(f"{len(regresiones)} regresiones por encima del {opciones.umbral:.0%} en tiempo "
+              f"o del {opciones.umbral_memoria:.0%} en memoria")
+        return 1
+    print("Sin regresiones")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(ejecutar_desde_linea_de_comandos())
@@ -1,5 +1,158 @@
 # Importar fracciones para manejar números racionales
+import argparse
+import asyncio
+import atexit
+import hashlib
+import heapq
+import json
+import mmap
+import multiprocessing
+import os
+import signal
+import socket
+import struct
+import sys
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
 from fractions import Fraction
+from functools import wraps
+from itertools import chain
+from math import gcd, isqrt, lcm
+from numbers import Number
+from operator import add, mul, sub
+from time import perf_counter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+######################################################
+################### Instrumentación ##################
+######################################################
+
+class Instrumentacion:
+    # Contadores de una ejecución: operaciones aritméticas, reducciones por mcd de Fraction,
+    # crecimiento en bits de los coeficientes por paso, intercambios de filas y tiempos por fase
+    def __init__(self):
+        self.operaciones = 0
+        self.reducciones_mcd = 0
+        self.intercambios = 0
+        self.pasos = []
+        self.fases = {}
+        self.llamadas = {}
+        self._fases_abiertas = set()
+
+    def contar(self, operaciones, reducciones_mcd=0):
+        self.operaciones += operaciones
+        self.reducciones_mcd += reducciones_mcd
+
+    def intercambio(self, cantidad=1):
+        self.intercambios += cantidad
+
+    def registrar_paso(self, funcion, paso, valores):
+        # Los enteros también tienen numerator y denominator, así sirve para Fraction y para int
+        bits_numerador = 0
+        bits_denominador = 0
+        for x in valores:
+            bits = x.numerator.bit_length()
+            if bits > bits_numerador:
+                bits_numerador = bits
+            bits = x.denominator.bit_length()
+            if bits > bits_denominador:
+                bits_denominador = bits
+        self.pasos.append({'funcion': funcion, 'paso': paso,
+                           'bits_numerador': bits_numerador, 'bits_denominador': bits_denominador})
+
+    def registrar_llamada(self, funcion, tiempo):
+        llamada = self.llamadas.setdefault(funcion, {'llamadas': 0, 'tiempo': 0.0})
+        llamada['llamadas'] += 1
+        llamada['tiempo'] += tiempo
+
+    @contextmanager
+    def fase(self, nombre):
+        # Solo cuenta el nivel más externo para no sumar dos veces las llamadas anidadas
+        if nombre in self._fases_abiertas:
+            yield
+            return
+        self._fases_abiertas.add(nombre)
+        inicio = perf_counter()
+        try:
+            yield
+        finally:
+            self._fases_abiertas.discard(nombre)
+            self.fases[nombre] = self.fases.get(nombre, 0.0) + perf_counter() - inicio
+
+    def a_dict(self):
+        return {
+            'operaciones': self.operaciones,
+            'reducciones_mcd': self.reducciones_mcd,
+            'intercambios': self.intercambios,
+            'bits_numerador_maximo': max((p['bits_numerador'] for p in self.pasos), default=0),
+            'bits_denominador_maximo': max((p['bits_denominador'] for p in self.pasos), default=0),
+            'pasos': self.pasos,
+            'fases': self.fases,
+            'llamadas': self.llamadas
+        }
+
+    def a_json(self):
+        return json.dumps(self.a_dict(), ensure_ascii=False)
+
+    def resumen(self):
+        datos = self.a_dict()
+        lineas = [f"Instrumentación: {self.operaciones} operaciones, {self.reducciones_mcd} reducciones por mcd, "
+                  f"{self.intercambios} intercambios de filas"]
+        if self.pasos:
+            lineas.append(f"Bits máximos: numerador {datos['bits_numerador_maximo']}, "
+                          f"denominador {datos['bits_denominador_maximo']} ({len(self.pasos)} pasos registrados)")
+        if self.fases:
+            lineas.append("Fases: " + ", ".join(f"{nombre} {tiempo:.6f} s" for nombre, tiempo in self.fases.items()))
+        if self.llamadas:
+            lineas.append("Funciones: " + ", ".join(f"{nombre} x{llamada['llamadas']} {llamada['tiempo']:.6f} s"
+                                                    for nombre, llamada in self.llamadas.items()))
+        return '\n'.join(lineas)
+
+
+# Con la instrumentación desactivada cada función solo paga una comparación con None
+_instrumentacion = None
+_SIN_FASE = nullcontext()
+
+
+@contextmanager
+def instrumentar():
+    global _instrumentacion
+    anterior = _instrumentacion
+    _instrumentacion = Instrumentacion()
+    try:
+        yield _instrumentacion
+    finally:
+        _instrumentacion = anterior
+
+
+def _fase(nombre):
+    return _SIN_FASE if _instrumentacion is None else _instrumentacion.fase(nombre)
+
+
+def _instrumentado(fase="calculo"):
+    def decorador(funcion):
+        nombre = funcion.__name__
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            datos = _instrumentacion
+            if datos is None:
+                return funcion(*args, **kwargs)
+            inicio = perf_counter()
+            with datos.fase(fase):
+                try:
+                    return funcion(*args, **kwargs)
+                finally:
+                    datos.registrar_llamada(nombre, perf_counter() - inicio)
+        return envoltura
+    return decorador
 
 
 ######################################################
@@ -7,237 +160,2597 @@ from fractions import Fraction
 ######################################################
 
 def nueva_matriz(filas, columnas, datos):
-    return {
-        'filas': filas,
-        'columnas': columnas,
-        'datos': [[Fraction(x) for x in fila] for fila in datos]
-    }
+    return Matriz(filas, columnas, datos)
 
 
 def duplicar_matriz(matriz):
-    return nueva_matriz(matriz['filas'], matriz['columnas'],
-                         [fila[:] for fila in matriz['datos']])
-
-
+    if isinstance(matriz, (Matriz, VistaMatriz)):
+        return matriz.copiar()
+    return Matriz.desde_dict(a_densa(matriz))
+
+
+# Denominador común máximo con el que se guardan los numeradores como enteros
+LIMITE_DENOMINADOR_COMUN = 2 ** 64
+MAXIMO_INT64 = 2 ** 63 - 1
+
+
+class Matriz:
+    # Almacenamiento contiguo por filas. Si todos los elementos comparten un denominador
+    # razonable se guardan solo los numeradores enteros (en un array de 64 bits si caben)
+    __slots__ = ('filas', 'columnas', '_valores', '_denominador')
+
+    def __init__(self, filas, columnas, datos=None):
+        self.filas = filas
+        self.columnas = columnas
+        if datos is None:
+            self._valores = array('q', bytes(8 * filas * columnas))
+            self._denominador = 1
+            return
+
+        valores = []
+        cantidad = 0
+        for fila in datos:
+            fila = [x if type(x) is Fraction else Fraction(x) for x in fila]
+            if len(fila) != columnas:
+                raise ValueError("Todas las filas deben tener tantos elementos como columnas tiene la matriz")
+            valores.extend(fila)
+            cantidad += 1
+        if cantidad != filas:
+            raise ValueError("Los datos no coinciden con las dimensiones de la matriz")
+        self._guardar(valores)
+
+    def _guardar(self, valores):
+        comun = 1
+        for x in valores:
+            comun = lcm(comun, x.denominator)
+            if comun > LIMITE_DENOMINADOR_COMUN:
+                self._valores = valores
+                self._denominador = None
+                return
+
+        numeradores = [x.numerator * (comun // x.denominator) for x in valores]
+        if all(-MAXIMO_INT64 <= x <= MAXIMO_INT64 for x in numeradores):
+            numeradores = array('q', numeradores)
+        self._valores = numeradores
+        self._denominador = comun
+
+    @classmethod
+    def desde_dict(cls, matriz):
+        return cls(matriz['filas'], matriz['columnas'], matriz['datos'])
+
+    @classmethod
+    def desde_filas_enteras(cls, filas, escalas, columnas=None):
+        # Construye la matriz a partir de filas de enteros y el denominador de cada fila (como las
+        # devuelve _filas_enteras) sin pasar por Fraction
+        matriz = cls.__new__(cls)
+        matriz.filas = len(filas)
+        matriz.columnas = len(filas[0]) if filas else columnas or 0
+        comun = 1
+        for escala in escalas:
+            comun = lcm(comun, escala)
+            if comun > LIMITE_DENOMINADOR_COMUN:
+                matriz._guardar([Fraction(x, escala) for fila, escala in zip(filas, escalas) for x in fila])
+                return matriz
+        numeradores = array('q')
+        try:
+            for fila, escala in zip(filas, escalas):
+                numeradores.extend(fila if escala == comun else [x * (comun // escala) for x in fila])
+        except OverflowError:
+            # Algún numerador no cabe en 64 bits: se guardan como enteros de Python
+            numeradores = [x * (comun // escala) for fila, escala in zip(filas, escalas) for x in fila]
+        matriz._valores = numeradores
+        matriz._denominador = comun
+        return matriz
+
+    def a_dict(self):
+        return {'filas': self.filas, 'columnas': self.columnas, 'datos': self.como_listas()}
+
+    def _indice(self, clave):
+        i, j = clave
+        if not (0 <= i < self.filas and 0 <= j < self.columnas):
+            raise IndexError("Índice fuera de la matriz")
+        return i * self.columnas + j
+
+    def _valor(self, indice):
+        if self._denominador is None:
+            return self._valores[indice]
+        return Fraction(self._valores[indice], self._denominador)
+
+    def iterar_filas(self):
+        c = self.columnas
+        for i in range(self.filas):
+            fila = self._valores[i * c:(i + 1) * c]
+            if self._denominador is None:
+                yield fila
+            else:
+                d = self._denominador
+                yield [Fraction(x, d) for x in fila]
+
+    def filas_enteras(self):
+        # Filas de numeradores y el denominador de cada una, sin crear ningún Fraction
+        if self._denominador is None:
+            return _filas_enteras(self._valores[i * self.columnas:(i + 1) * self.columnas] for i in range(self.filas))
+        return self._enteras([self._valores[i * self.columnas:(i + 1) * self.columnas] for i in range(self.filas)])
+
+    def columnas_enteras(self):
+        if self._denominador is None:
+            return _filas_enteras(self._valores[j::self.columnas] for j in range(self.columnas))
+        return self._enteras([self._valores[j::self.columnas] for j in range(self.columnas)])
+
+    def _enteras(self, partes):
+        # Cada fila (o columna) se divide por el mcd de sus numeradores con el denominador común, lo
+        # que da el mismo denominador mínimo que _filas_enteras
+        d = self._denominador
+        filas = []
+        escalas = []
+        for parte in partes:
+            g = gcd(d, *parte)
+            filas.append([x // g for x in parte] if g != 1 else list(parte))
+            escalas.append(d // g)
+        return filas, escalas
+
+    def como_listas(self):
+        c = self.columnas
+        if self._denominador is None:
+            valores = self._valores
+        else:
+            d = self._denominador
+            valores = [Fraction(x, d) for x in self._valores]
+        return [valores[i * c:(i + 1) * c] for i in range(self.filas)]
+
+    def __getitem__(self, clave):
+        # Compatibilidad con las funciones que reciben el diccionario de nueva_matriz
+        if clave == 'filas':
+            return self.filas
+        if clave == 'columnas':
+            return self.columnas
+        if clave == 'datos':
+            return self.como_listas()
+        return self._valor(self._indice(clave))
+
+    def __setitem__(self, clave, valor):
+        indice = self._indice(clave)
+        valor = valor if type(valor) is Fraction else Fraction(valor)
+        if self._denominador is not None:
+            if self._denominador % valor.denominator == 0:
+                numerador = valor.numerator * (self._denominador // valor.denominator)
+                if type(self._valores) is list or -MAXIMO_INT64 <= numerador <= MAXIMO_INT64:
+                    self._valores[indice] = numerador
+                    return
+            valores = [self._valor(k) for k in range(len(self._valores))]
+            valores[indice] = valor
+            self._guardar(valores)
+            return
+        self._valores[indice] = valor
+
+    def __iter__(self):
+        return iter(self.como_listas())
+
+    def __eq__(self, otra):
+        if isinstance(otra, dict) and not _es_dispersa(otra):
+            return (self.filas, self.columnas) == (otra['filas'], otra['columnas']) and self.como_listas() == otra['datos']
+        if not isinstance(otra, (Matriz, VistaMatriz)):
+            return NotImplemented
+        return (self.filas, self.columnas) == (otra.filas, otra.columnas) and self.como_listas() == otra.como_listas()
+
+    def __repr__(self):
+        return f"Matriz({self.filas}, {self.columnas}, {self.como_listas()!r})"
+
+    def copiar(self):
+        copia = Matriz.__new__(Matriz)
+        copia.filas = self.filas
+        copia.columnas = self.columnas
+        copia._valores = self._valores[:]
+        copia._denominador = self._denominador
+        return copia
+
+    def fila(self, i):
+        return VistaMatriz(self, i * self.columnas, 1, self.columnas, self.columnas)
+
+    def columna(self, j):
+        return VistaMatriz(self, j, self.filas, 1, self.columnas)
+
+    def submatriz(self, fila_inicio, fila_fin, columna_inicio, columna_fin):
+        return VistaMatriz(self, fila_inicio * self.columnas + columna_inicio,
+                           fila_fin - fila_inicio, columna_fin - columna_inicio, self.columnas)
+
+
+class VistaMatriz:
+    # Vista sin copia de un bloque rectangular de una Matriz
+    __slots__ = ('base', 'desplazamiento', 'filas', 'columnas', 'paso')
+
+    def __init__(self, base, desplazamiento, filas, columnas, paso):
+        self.base = base
+        self.desplazamiento = desplazamiento
+        self.filas = filas
+        self.columnas = columnas
+        self.paso = paso
+
+    def como_listas(self):
+        valor = self.base._valor
+        return [[valor(self.desplazamiento + i * self.paso + j) for j in range(self.columnas)]
+                for i in range(self.filas)]
+
+    def __getitem__(self, clave):
+        if clave == 'filas':
+            return self.filas
+        if clave == 'columnas':
+            return self.columnas
+        if clave == 'datos':
+            return self.como_listas()
+        i, j = clave
+        if not (0 <= i < self.filas and 0 <= j < self.columnas):
+            raise IndexError("Índice fuera de la vista")
+        return self.base._valor(self.desplazamiento + i * self.paso + j)
+
+    def __setitem__(self, clave, valor):
+        i, j = clave
+        if not (0 <= i < self.filas and 0 <= j < self.columnas):
+            raise IndexError("Índice fuera de la vista")
+        c = self.base.columnas
+        indice = self.desplazamiento + i * self.paso + j
+        self.base[indice // c, indice % c] = valor
+
+    def __iter__(self):
+        # Filas de la vista, como en Matriz
+        valor = self.base._valor
+        for i in range(self.filas):
+            inicio = self.desplazamiento + i * self.paso
+            yield [valor(inicio + j) for j in range(self.columnas)]
+
+    def __eq__(self, otra):
+        if not isinstance(otra, (Matriz, VistaMatriz)):
+            return NotImplemented
+        return (self.filas, self.columnas) == (otra.filas, otra.columnas) and self.como_listas() == otra.como_listas()
+
+    def __repr__(self):
+        return f"VistaMatriz({self.filas}, {self.columnas}, {self.como_listas()!r})"
+
+    def copiar(self):
+        return Matriz(self.filas, self.columnas, self.como_listas())
+
+    def submatriz(self, fila_inicio, fila_fin, columna_inicio, columna_fin):
+        return VistaMatriz(self.base, self.desplazamiento + fila_inicio * self.paso + columna_inicio,
+                           fila_fin - fila_inicio, columna_fin - columna_inicio, self.paso)
+
+
+@_instrumentado("formato")
 def matriz_string(matriz):
+    if _es_dispersa(matriz):
+        matriz = a_densa(matriz)
     return '\n'.join([' '.join(map(str, fila)) for fila in matriz['datos']])
 
 
+# Con un límite, cada número leído se aproxima por la fracción más cercana con denominador acotado
+limite_denominador_sesion = None
+
+
+def parsear_numero(texto, limite_denominador=None):
+    # Enteros, decimales, fracciones a/b y notación científica se leen directo como racionales exactos,
+    # sin pasar por float (0.1 queda como 1/10 y no como 3602879701896397/36028797018963968)
+    try:
+        valor = Fraction(texto.strip())
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"Número no válido: {texto}")
+    if limite_denominador is not None:
+        valor = valor.limit_denominator(limite_denominador)
+    return valor
+
+
+def parsear_fila(texto, columnas=None, limite_denominador=None):
+    fila = [parsear_numero(x, limite_denominador) for x in texto.split()]
+    if columnas is not None and len(fila) != columnas:
+        raise ValueError(f"Debes ingresar exactamente {columnas} números")
+    return fila
+
+
+def parsear_matriz(texto, filas=None, columnas=None, limite_denominador=None):
+    # Las filas se separan con ';' o saltos de línea y los elementos con espacios
+    lineas = [linea for linea in texto.replace(';', '\n').splitlines() if linea.strip()]
+    if not lineas:
+        raise ValueError("La matriz está vacía")
+    if filas is not None and len(lineas) != filas:
+        raise ValueError(f"Debes ingresar exactamente {filas} filas")
+    datos = [parsear_fila(linea, columnas, limite_denominador) for linea in lineas]
+    columnas = len(datos[0])
+    if any(len(fila) != columnas for fila in datos):
+        raise ValueError("Todas las filas deben tener la misma cantidad de elementos")
+    return nueva_matriz(len(datos), columnas, datos)
+
+
+# Tamaño a partir del cual input_matriz ofrece el ingreso disperso
+ELEMENTOS_SUGERIR_DISPERSA = 25
+
+
+@_instrumentado("lectura")
 def input_matriz(contador = 0):
     while True:
         try:
-            filas = int(input(f"Ingrese la cantidad de filas de la matriz{f' {contador}' if contador > 0 else ''}: "))
+            respuesta = input(f"Ingrese la cantidad de filas de la matriz{f' {contador}' if contador > 0 else ''} "
+                              f"o la ruta de un archivo: ").strip()
+            if not respuesta.lstrip('+-').isdigit() and os.path.isfile(respuesta):
+                try:
+                    return cargar_matriz(respuesta, limite_denominador=limite_denominador_sesion)
+                except ValueError as e:
+                    print(f"Error: {e}")
+                    continue
+            filas = int(respuesta)
             columnas = int(input(f"Ingrese la cantidad de columnas de la matriz{f' {contador}' if contador > 0 else ''}: "))
             if filas <= 0 or columnas <= 0:
                 print("Las dimensiones deben ser un número positivo y entero")
                 continue
 
+            # Para matrices grandes se ofrece ingresar solo los elementos no nulos
+            if filas * columnas >= ELEMENTOS_SUGERIR_DISPERSA:
+                if input("¿Desea ingresar solo los elementos no nulos? (s/n): ").strip().lower() == 's':
+                    return input_matriz_dispersa(filas, columnas)
+
             matriz = []
             for i in range(filas):
                 while True:
-                    fila = input(f"Ingrese los números de la fila {i + 1} separados por un espacio (ejemplo: {' '.join(['#'] * columnas)}) si desea dejar espacios vacios escriba 0: ").split()
-                    if len(fila) != columnas:
-                        print(f"Debes ingresar exactamente {columnas} números")
-                        continue
+                    fila = input(f"Ingrese los números de la fila {i + 1} separados por un espacio (ejemplo: {' '.join(['#'] * columnas)}) si desea dejar espacios vacios escriba 0: ")
                     try:
-                        matriz.append([float(x) for x in fila])
+                        # En la primera fila también se puede pegar la matriz completa con las filas separadas por ';'
+                        if i == 0 and ';' in fila:
+                            return parsear_matriz(fila, filas, columnas, limite_denominador_sesion)
+                        matriz.append(parsear_fila(fila, columnas, limite_denominador_sesion))
                         break
-                    except ValueError:
-                        print("Formato no válido")
+                    except ValueError as e:
+                        print(f"Formato no válido: {e}")
             return nueva_matriz(filas, columnas, matriz)
         except ValueError:
             print("Las dimensiones deben ser un número positivo y entero")
 
 
+@_instrumentado("lectura")
 def input_escalar():
     while True:
         try:
-            return float(input("Ingrese el valor del escalar: "))
+            return parsear_numero(input("Ingrese el valor del escalar: "), limite_denominador_sesion)
         except ValueError:
             print("Valor no válido")
 
 
+######################################################
+################# Backends Numéricos #################
+######################################################
+
+class BackendNumpy:
+    # Aritmética de punto flotante (float64) vectorizada; usa LAPACK a través de numpy.linalg
+    nombre = "numpy"
+
+    def _arreglo(self, matriz):
+        if np is None:
+            raise ValueError("El backend numpy requiere tener instalado el paquete numpy")
+        return np.array(matriz['datos'], dtype=float)
+
+    def _matriz(self, arreglo):
+        return {'filas': arreglo.shape[0], 'columnas': arreglo.shape[1], 'datos': arreglo.tolist()}
+
+    def _comprobar_invertible(self, arreglo):
+        if np.linalg.cond(arreglo) >= 1 / np.finfo(float).eps:
+            raise ValueError("La matriz es singular o está muy mal condicionada")
+
+    def sumar(self, matriz1, matriz2):
+        return self._matriz(self._arreglo(matriz1) + self._arreglo(matriz2))
+
+    def restar(self, matriz1, matriz2):
+        return self._matriz(self._arreglo(matriz1) - self._arreglo(matriz2))
+
+    def multiplicar(self, matriz1, matriz2):
+        return self._matriz(self._arreglo(matriz1) @ self._arreglo(matriz2)), []
+
+    def multiplicar_escalar(self, matriz, escalar):
+        return self._matriz(self._arreglo(matriz) * float(escalar))
+
+    def determinante(self, matriz):
+        return float(np.linalg.det(self._arreglo(matriz)))
+
+    def condicion(self, matriz):
+        return float(np.linalg.cond(self._arreglo(matriz)))
+
+    def inversa(self, matriz):
+        arreglo = self._arreglo(matriz)
+        self._comprobar_invertible(arreglo)
+        return self._matriz(np.linalg.inv(arreglo))
+
+    def resolver(self, matriz_coeficientes, matriz_b):
+        arreglo = self._arreglo(matriz_coeficientes)
+        self._comprobar_invertible(arreglo)
+        determinante = float(np.linalg.det(arreglo))
+        soluciones = np.linalg.solve(arreglo, self._arreglo(matriz_b))
+        return self._matriz(soluciones), (soluciones * determinante).tolist(), determinante
+
+
+class BackendModular:
+    # Aritmética exacta módulo un primo, útil para comprobaciones rápidas
+    nombre = "modular"
+
+    def __init__(self, primo=2 ** 31 - 1):
+        self.primo = primo
+
+    def _reducir(self, valor):
+        valor = valor if type(valor) is Fraction else Fraction(valor)
+        if valor.denominator % self.primo == 0:
+            raise ValueError(f"El denominador {valor.denominator} no es invertible módulo {self.primo}")
+        return valor.numerator * pow(valor.denominator, -1, self.primo) % self.primo
+
+    def _datos(self, matriz):
+        return [[self._reducir(x) for x in fila] for fila in matriz['datos']]
+
+    def _matriz(self, datos):
+        return {'filas': len(datos), 'columnas': len(datos[0]) if datos else 0, 'datos': datos}
+
+    def sumar(self, matriz1, matriz2):
+        p = self.primo
+        return self._matriz([[(a + b) % p for a, b in zip(f1, f2)]
+                             for f1, f2 in zip(self._datos(matriz1), self._datos(matriz2))])
+
+    def restar(self, matriz1, matriz2):
+        p = self.primo
+        return self._matriz([[(a - b) % p for a, b in zip(f1, f2)]
+                             for f1, f2 in zip(self._datos(matriz1), self._datos(matriz2))])
+
+    def multiplicar(self, matriz1, matriz2):
+        p = self.primo
+        columnas = list(zip(*self._datos(matriz2)))
+        return self._matriz([[sum(a * b for a, b in zip(fila, columna)) % p for columna in columnas]
+                             for fila in self._datos(matriz1)]), []
+
+    def multiplicar_escalar(self, matriz, escalar):
+        p = self.primo
+        escalar = self._reducir(escalar)
+        return self._matriz([[x * escalar % p for x in fila] for fila in self._datos(matriz)])
+
+    def _eliminar(self, extendida, n):
+        # Gauss-Jordan módulo p sobre las n primeras columnas; devuelve el determinante
+        p = self.primo
+        determinante = 1
+        for k in range(n):
+            candidato = next((i for i in range(k, n) if extendida[i][k] != 0), None)
+            if candidato is None:
+                return 0
+            if candidato != k:
+                extendida[k], extendida[candidato] = extendida[candidato], extendida[k]
+                determinante = -determinante
+            determinante = determinante * extendida[k][k] % p
+            inverso = pow(extendida[k][k], -1, p)
+            extendida[k] = [x * inverso % p for x in extendida[k]]
+            fila_k = extendida[k]
+            for i in range(n):
+                factor = extendida[i][k]
+                if i != k and factor != 0:
+                    extendida[i] = [(a - factor * b) % p for a, b in zip(extendida[i], fila_k)]
+        return determinante % p
+
+    def determinante(self, matriz):
+        return self._eliminar(self._datos(matriz), matriz['filas'])
+
+    def inversa(self, matriz):
+        n = matriz['filas']
+        extendida = [fila + [1 if i == j else 0 for j in range(n)] for i, fila in enumerate(self._datos(matriz))]
+        if self._eliminar(extendida, n) == 0:
+            raise ValueError(f"La matriz no es invertible módulo {self.primo}")
+        return self._matriz([fila[n:] for fila in extendida])
+
+    def resolver(self, matriz_coeficientes, matriz_b):
+        n = matriz_coeficientes['filas']
+        extendida = [fila + fila_b for fila, fila_b in zip(self._datos(matriz_coeficientes), self._datos(matriz_b))]
+        determinante = self._eliminar(extendida, n)
+        if determinante == 0:
+            raise ValueError(f"El sistema no tiene solución única módulo {self.primo}")
+        soluciones = [fila[n:] for fila in extendida]
+        numeradores = [[x * determinante % self.primo for x in fila] for fila in soluciones]
+        return self._matriz(soluciones), numeradores, determinante
+
+
+BACKENDS = {
+    'fraccion': None,
+    'numpy': BackendNumpy(),
+    'modular': BackendModular(),
+}
+
+# Backend usado cuando una función no recibe uno explícito
+backend_sesion = 'fraccion'
+
+
+def establecer_backend(nombre):
+    global backend_sesion
+    if nombre not in BACKENDS:
+        raise ValueError(f"Backend no reconocido. Use uno de: {', '.join(BACKENDS)}")
+    if nombre == 'numpy' and np is None:
+        raise ValueError("El backend numpy requiere tener instalado el paquete numpy")
+    backend_sesion = nombre
+
+
+def _obtener_backend(backend):
+    # None representa el backend exacto con Fraction implementado en las propias funciones
+    if backend is None:
+        backend = backend_sesion
+    if isinstance(backend, str):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend no reconocido. Use uno de: {', '.join(BACKENDS)}")
+        return BACKENDS[backend]
+    return backend
+
+
+@_instrumentado()
+def numero_condicion(matriz):
+    if matriz['filas'] != matriz['columnas']:
+        raise ValueError("El número de condición solo se puede calcular para matrices cuadradas")
+    return BACKENDS['numpy'].condicion(matriz)
+
+
+######################################################
+############### Núcleo de Multiplicación #############
+######################################################
+
+# Parámetros del núcleo de multiplicación exacta
+TAMANO_BLOQUE = 64
+UMBRAL_STRASSEN = 256
+UMBRAL_PARALELO = 200 ** 3
+
+# Columnas de B compartidas con cada proceso trabajador
+_columnas_trabajador = None
+
+
+def _filas_enteras(datos):
+    # Multiplica cada fila por el mínimo común múltiplo de sus denominadores
+    if isinstance(datos, Matriz):
+        return datos.filas_enteras()
+    filas = []
+    escalas = []
+    for fila in datos:
+        # Las entradas flotantes (resultados del backend numpy) se toman por su valor exacto
+        fila = [x if isinstance(x, Fraction) else Fraction(x) for x in fila]
+        comun = 1
+        for x in fila:
+            comun = lcm(comun, x.denominator)
+        filas.append([x.numerator * (comun // x.denominator) for x in fila])
+        escalas.append(comun)
+    return filas, escalas
+
+
+def _filas_enteras_de(matriz):
+    # Una Matriz entrega sus numeradores directamente; el resto se recorre fila a fila
+    return _filas_enteras(matriz if isinstance(matriz, Matriz) else _iterar_filas(matriz))
+
+
+def _iterar_filas_enteras(matriz):
+    # Como _filas_enteras_de, pero entrega (fila, denominador) de a una fila
+    if isinstance(matriz, Matriz):
+        yield from zip(*matriz.filas_enteras())
+        return
+    for fila in _iterar_filas(matriz):
+        (enteros,), (escala,) = _filas_enteras([fila])
+        yield enteros, escala
+
+
+def _producto_bloques(filas_a, columnas_b, tamano=TAMANO_BLOQUE):
+    # Recorre la salida por bloques para reutilizar las mismas filas y columnas mientras están en caché
+    resultado = [[0] * len(columnas_b) for _ in filas_a]
+    for i0 in range(0, len(filas_a), tamano):
+        bloque_a = filas_a[i0:i0 + tamano]
+        for j0 in range(0, len(columnas_b), tamano):
+            bloque_b = columnas_b[j0:j0 + tamano]
+            for di, fila in enumerate(bloque_a):
+                destino = resultado[i0 + di]
+                for dj, columna in enumerate(bloque_b):
+                    destino[j0 + dj] = sum(map(mul, fila, columna))
+    return resultado
+
+
+def _sumar_bloques(x, y):
+    return [list(map(add, fx, fy)) for fx, fy in zip(x, y)]
+
+
+def _restar_bloques(x, y):
+    return [list(map(sub, fx, fy)) for fx, fy in zip(x, y)]
+
+
+def _producto_strassen(a, b, umbral=UMBRAL_STRASSEN):
+    # Variante de Winograd (7 productos y 15 sumas) sobre filas de enteros
+    m = len(a)
+    k = len(b)
+    p = len(b[0]) if b else 0
+    if min(m, k, p) <= umbral:
+        return _producto_bloques(a, list(zip(*b)))
+
+    # Completar con ceros hasta dimensiones pares
+    if m % 2:
+        a = a + [[0] * k]
+    if k % 2:
+        a = [fila + [0] for fila in a]
+        b = b + [[0] * p]
+    if p % 2:
+        b = [fila + [0] for fila in b]
+    mm, kk, pp = len(a) // 2, len(b) // 2, len(b[0]) // 2
+
+    a11 = [fila[:kk] for fila in a[:mm]]
+    a12 = [fila[kk:] for fila in a[:mm]]
+    a21 = [fila[:kk] for fila in a[mm:]]
+    a22 = [fila[kk:] for fila in a[mm:]]
+    b11 = [fila[:pp] for fila in b[:kk]]
+    b12 = [fila[pp:] for fila in b[:kk]]
+    b21 = [fila[:pp] for fila in b[kk:]]
+    b22 = [fila[pp:] for fila in b[kk:]]
+
+    s1 = _sumar_bloques(a21, a22)
+    s2 = _restar_bloques(s1, a11)
+    s3 = _restar_bloques(a11, a21)
+    s4 = _restar_bloques(a12, s2)
+    t1 = _restar_bloques(b12, b11)
+    t2 = _restar_bloques(b22, t1)
+    t3 = _restar_bloques(b22, b12)
+    t4 = _restar_bloques(t2, b21)
+
+    m1 = _producto_strassen(a11, b11, umbral)
+    m2 = _producto_strassen(a12, b21, umbral)
+    m3 = _producto_strassen(s4, b22, umbral)
+    m4 = _producto_strassen(a22, t4, umbral)
+    m5 = _producto_strassen(s1, t1, umbral)
+    m6 = _producto_strassen(s2, t2, umbral)
+    m7 = _producto_strassen(s3, t3, umbral)
+
+    u2 = _sumar_bloques(m1, m6)
+    u3 = _sumar_bloques(u2, m7)
+    u4 = _sumar_bloques(u2, m5)
+    c11 = _sumar_bloques(m1, m2)
+    c12 = _sumar_bloques(u4, m3)
+    c21 = _restar_bloques(u3, m4)
+    c22 = _sumar_bloques(u3, m5)
+
+    resultado = [f1 + f2 for f1, f2 in zip(c11, c12)] + [f1 + f2 for f1, f2 in zip(c21, c22)]
+    return [fila[:p] for fila in resultado[:m]]
+
+
+def _iniciar_trabajador(columnas_b):
+    global _columnas_trabajador
+    _columnas_trabajador = columnas_b
+
+
+def _producto_filas_trabajador(filas_a):
+    return _producto_bloques(filas_a, _columnas_trabajador)
+
+
+def _producto_paralelo(filas_a, columnas_b, procesos=None):
+    # Reparte bloques de filas de la salida entre varios procesos
+    procesos = procesos or os.cpu_count() or 1
+    paso = max(1, -(-len(filas_a) // (procesos * 4)))
+    tramos = [filas_a[i:i + paso] for i in range(0, len(filas_a), paso)]
+    with ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador, initargs=(columnas_b,)) as ejecutor:
+        return [fila for parte in ejecutor.map(_producto_filas_trabajador, tramos) for fila in parte]
+
+
+######################################################
+############### Aritmética Multimodular ##############
+######################################################
+
+# Primos de 62 bits usados para los cálculos modulares, generados bajo demanda
+_primos_modulares = []
+
+# Filas enteras compartidas con cada proceso trabajador
+_filas_trabajador = None
+
+
+def _es_primo(n):
+    # Miller-Rabin determinista para n < 3.3 * 10^24
+    if n < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+    for b in bases:
+        if n % b == 0:
+            return n == b
+    d = n - 1
+    r = 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+    for b in bases:
+        x = pow(b, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _primo_modular(indice):
+    candidato = _primos_modulares[-1] - 2 if _primos_modulares else 2 ** 62 - 1
+    while len(_primos_modulares) <= indice:
+        if _es_primo(candidato):
+            _primos_modulares.append(candidato)
+        candidato -= 2
+    return _primos_modulares[indice]
+
+
+def _cota_hadamard(columnas):
+    # |det| <= producto de las normas euclidianas de las columnas
+    cota = 1
+    for columna in columnas:
+        cota *= isqrt(sum(x * x for x in columna)) + 1
+    return cota
+
+
+def _determinante_mod(filas, p):
+    a = [[x % p for x in fila] for fila in filas]
+    n = len(a)
+    determinante = 1
+    for k in range(n):
+        candidato = next((i for i in range(k, n) if a[i][k] != 0), None)
+        if candidato is None:
+            return 0
+        if candidato != k:
+            a[k], a[candidato] = a[candidato], a[k]
+            determinante = -determinante
+        fila_k = a[k]
+        pivote = fila_k[k]
+        determinante = determinante * pivote % p
+        inverso = pow(pivote, -1, p)
+        for i in range(k + 1, n):
+            fila_i = a[i]
+            factor = fila_i[k] * inverso % p
+            if factor:
+                for j in range(k + 1, n):
+                    fila_i[j] = (fila_i[j] - factor * fila_k[j]) % p
+    return determinante % p
+
+
+def _resolver_mod(filas, p):
+    # Resuelve [A | b] módulo p; devuelve el determinante y la solución (None si A es singular módulo p)
+    a = [[x % p for x in fila] for fila in filas]
+    n = len(a)
+    determinante = 1
+    for k in range(n):
+        candidato = next((i for i in range(k, n) if a[i][k] != 0), None)
+        if candidato is None:
+            return 0, None
+        if candidato != k:
+            a[k], a[candidato] = a[candidato], a[k]
+            determinante = -determinante
+        pivote = a[k][k]
+        determinante = determinante * pivote % p
+        inverso = pow(pivote, -1, p)
+        a[k] = [x * inverso % p for x in a[k]]
+        fila_k = a[k]
+        for i in range(n):
+            factor = a[i][k]
+            if i != k and factor:
+                a[i] = [(x - factor * y) % p for x, y in zip(a[i], fila_k)]
+    return determinante % p, [fila[n] for fila in a]
+
+
+def _iniciar_trabajador_modular(filas):
+    global _filas_trabajador
+    _filas_trabajador = filas
+
+
+def _determinante_mod_trabajador(p):
+    return _determinante_mod(_filas_trabajador, p)
+
+
+def _resolver_mod_trabajador(p):
+    return _resolver_mod(_filas_trabajador, p)
+
+
+def _combinar_crt(residuo, modulo, residuo_p, p):
+    residuo += modulo * ((residuo_p - residuo) * pow(modulo % p, -1, p) % p)
+    return residuo, modulo * p
+
+
+def _simetrico(residuo, modulo):
+    return residuo - modulo if residuo > modulo // 2 else residuo
+
+
+def _reconstruccion_racional(residuo, modulo):
+    # Busca n/d con |n|, d <= sqrt(modulo / 2) tal que n ≡ d · residuo (mod modulo)
+    limite = isqrt(modulo // 2)
+    r0, r1 = modulo, residuo % modulo
+    t0, t1 = 0, 1
+    while r1 > limite:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        t0, t1 = t1, t0 - q * t1
+    if t1 == 0 or abs(t1) > limite:
+        return None
+    return Fraction(r1, t1)
+
+
+def _lotes_de_primos(funcion, funcion_trabajador, filas, procesos):
+    # Genera los resultados por primo, en paralelo cuando se piden varios procesos
+    procesos = procesos or 1
+    indice = 0
+    if procesos == 1:
+        while True:
+            p = _primo_modular(indice)
+            indice += 1
+            yield p, funcion(filas, p)
+    with ProcessPoolExecutor(procesos, initializer=_iniciar_trabajador_modular, initargs=(filas,)) as ejecutor:
+        while True:
+            primos = [_primo_modular(indice + i) for i in range(procesos)]
+            indice += procesos
+            yield from zip(primos, ejecutor.map(funcion_trabajador, primos))
+
+
+def _determinante_multimodular(datos, procesos=None):
+    filas, escala = _escalar_filas_a_enteros(datos)
+    cota = 2 * _cota_hadamard(zip(*filas))
+    residuo, modulo = 0, 1
+    lotes = _lotes_de_primos(_determinante_mod, _determinante_mod_trabajador, filas, procesos)
+    try:
+        for p, determinante_p in lotes:
+            residuo, modulo = _combinar_crt(residuo, modulo, determinante_p, p)
+            if modulo > cota:
+                break
+    finally:
+        lotes.close()
+    return Fraction(_simetrico(residuo, modulo), escala)
+
+
+def _resolver_multimodular(datos_A, columna_b, procesos=None, con_numeradores=True):
+    # Devuelve (soluciones, numeradores det(A_i), det(A)); sin numeradores puede terminar antes
+    # reconstruyendo las soluciones racionales y verificándolas
+    filas, escala = _escalar_filas_a_enteros([fila + [b] for fila, b in zip(datos_A, columna_b)])
+    n = len(filas)
+    columnas = list(zip(*filas))
+    norma_b = isqrt(sum(x * x for x in columnas[n])) + 1
+    cota = 1
+    for columna in columnas[:n]:
+        cota *= max(isqrt(sum(x * x for x in columna)) + 1, norma_b)
+    cota *= 2
+
+    det_residuo, numeradores_residuo, modulo = 0, [0] * n, 1
+    soluciones_residuo, modulo_soluciones = [0] * n, 1
+    modulo_singular = 1
+    soluciones = None
+    lotes = _lotes_de_primos(_resolver_mod, _resolver_mod_trabajador, filas, procesos)
+    try:
+        for numero, (p, (determinante_p, x_p)) in enumerate(lotes, 1):
+            if x_p is None:
+                # Primo desafortunado o matriz singular: si det(A) ≡ 0 módulo un producto mayor que la cota, det(A) = 0
+                modulo_singular *= p
+                if modulo_singular > cota:
+                    raise ValueError("El determinante de A es 0, el sistema no tiene solución única")
+                continue
+
+            det_residuo, nuevo_modulo = _combinar_crt(det_residuo, modulo, determinante_p, p)
+            numeradores_residuo = [_combinar_crt(r, modulo, determinante_p * x % p, p)[0]
+                                   for r, x in zip(numeradores_residuo, x_p)]
+            modulo = nuevo_modulo
+            if modulo > cota:
+                break
+
+            if not con_numeradores:
+                soluciones_residuo = [_combinar_crt(r, modulo_soluciones, x, p)[0]
+                                      for r, x in zip(soluciones_residuo, x_p)]
+                modulo_soluciones *= p
+                if numero % 4 == 0:
+                    candidatas = [_reconstruccion_racional(r, modulo_soluciones) for r in soluciones_residuo]
+                    if None not in candidatas and all(
+                            sum(map(mul, fila[:n], candidatas)) == fila[n] for fila in filas):
+                        soluciones = candidatas
+                        break
+    finally:
+        lotes.close()
+
+    if soluciones is not None:
+        return soluciones, None, None
+
+    determinante = _simetrico(det_residuo, modulo)
+    numeradores = [_simetrico(r, modulo) for r in numeradores_residuo]
+    return ([Fraction(x, determinante) for x in numeradores],
+            [Fraction(x, escala) for x in numeradores], Fraction(determinante, escala))
+
+
+######################################################
+################# Matrices Dispersas #################
+######################################################
+
+# Las matrices dispersas guardan por cada fila un diccionario {columna: valor} solo con los no nulos
+
+def nueva_matriz_dispersa(filas, columnas, entradas):
+    datos = [{} for _ in range(filas)]
+    elementos = entradas.items() if isinstance(entradas, dict) else (((i, j), v) for i, j, v in entradas)
+    for (i, j), valor in elementos:
+        if not (0 <= i < filas and 0 <= j < columnas):
+            raise ValueError(f"La posición ({i + 1}, {j + 1}) está fuera de la matriz")
+        valor = valor if type(valor) is Fraction else Fraction(valor)
+        if valor != 0:
+            datos[i][j] = valor
+        else:
+            datos[i].pop(j, None)
+    return {'filas': filas, 'columnas': columnas, 'dispersa': True, 'entradas': datos}
+
+
+def _es_dispersa(matriz):
+    return isinstance(matriz, dict) and matriz.get('dispersa', False)
+
+
+def a_dispersa(matriz):
+    if _es_dispersa(matriz):
+        return matriz
+    return {
+        'filas': matriz['filas'],
+        'columnas': matriz['columnas'],
+        'dispersa': True,
+        'entradas': [{j: x for j, x in enumerate(fila) if x != 0} for fila in matriz['datos']]
+    }
+
+
+def a_densa(matriz):
+    if not _es_dispersa(matriz):
+        return matriz
+    cero = Fraction(0)
+    datos = []
+    for fila in matriz['entradas']:
+        densa = [cero] * matriz['columnas']
+        for j, x in fila.items():
+            densa[j] = x
+        datos.append(densa)
+    return {'filas': matriz['filas'], 'columnas': matriz['columnas'], 'datos': datos}
+
+
+def elementos_no_nulos(matriz):
+    return sum(len(fila) for fila in matriz['entradas'])
+
+
+def _combinar_dispersas(matriz1, matriz2, signo):
+    entradas = []
+    for fila1, fila2 in zip(matriz1['entradas'], matriz2['entradas']):
+        fila = dict(fila1)
+        for j, x in fila2.items():
+            nuevo = fila.get(j, 0) + x if signo > 0 else fila.get(j, 0) - x
+            if nuevo != 0:
+                fila[j] = nuevo
+            else:
+                fila.pop(j, None)
+        entradas.append(fila)
+    return {'filas': matriz1['filas'], 'columnas': matriz1['columnas'], 'dispersa': True, 'entradas': entradas}
+
+
+def _escalar_dispersa(matriz, escalar):
+    escalar = escalar if type(escalar) is Fraction else Fraction(escalar)
+    entradas = [{j: x * escalar for j, x in fila.items()} if escalar != 0 else {} for fila in matriz['entradas']]
+    return {'filas': matriz['filas'], 'columnas': matriz['columnas'], 'dispersa': True, 'entradas': entradas}
+
+
+def _multiplicar_dispersas(matriz1, matriz2):
+    # Producto fila por fila: solo se recorren los pares de no nulos que coinciden en k
+    filas_b = matriz2['entradas']
+    entradas = []
+    for fila in matriz1['entradas']:
+        acumulado = {}
+        for k, a in fila.items():
+            for j, b in filas_b[k].items():
+                acumulado[j] = acumulado.get(j, 0) + a * b
+        entradas.append({j: x for j, x in acumulado.items() if x != 0})
+    return {'filas': matriz1['filas'], 'columnas': matriz2['columnas'], 'dispersa': True, 'entradas': entradas}
+
+
+def _signo_permutacion(permutacion):
+    signo = 1
+    visitados = [False] * len(permutacion)
+    for inicio in range(len(permutacion)):
+        if visitados[inicio]:
+            continue
+        largo = 0
+        i = inicio
+        while not visitados[i]:
+            visitados[i] = True
+            i = permutacion[i]
+            largo += 1
+        if largo % 2 == 0:
+            signo = -signo
+    return signo
+
+
+def _eliminar_markowitz(filas, columnas_pivote):
+    # Eliminación exacta eligiendo cada pivote con el menor costo de Markowitz (r - 1)(c - 1)
+    # entre las filas más cortas. Modifica las filas y devuelve los pivotes (fila, columna) o None si es singular
+    n = len(filas)
+    columnas = [set() for _ in range(columnas_pivote)]
+    for i, fila in enumerate(filas):
+        for j in fila:
+            if j < columnas_pivote:
+                columnas[j].add(i)
+
+    activas = [True] * n
+    monticulo = [(len(fila), i) for i, fila in enumerate(filas)]
+    heapq.heapify(monticulo)
+    pivotes = []
+
+    for _ in range(min(n, columnas_pivote)):
+        candidatas = []
+        while monticulo and len(candidatas) < 4:
+            largo, i = heapq.heappop(monticulo)
+            if activas[i] and largo == len(filas[i]) and i not in candidatas:
+                candidatas.append(i)
+        for i in candidatas:
+            heapq.heappush(monticulo, (len(filas[i]), i))
+
+        mejor = None
+        for i in candidatas:
+            r = sum(1 for j in filas[i] if j < columnas_pivote)
+            for j in filas[i]:
+                if j < columnas_pivote:
+                    costo = (r - 1) * (len(columnas[j]) - 1)
+                    if mejor is None or costo < mejor[0]:
+                        mejor = (costo, i, j)
+        if mejor is None:
+            return None
+
+        _, i, j = mejor
+        activas[i] = False
+        fila_pivote = filas[i]
+        pivote = fila_pivote[j]
+        for c in fila_pivote:
+            if c < columnas_pivote:
+                columnas[c].discard(i)
+
+        for r in list(columnas[j]):
+            fila_r = filas[r]
+            factor = fila_r.pop(j) / pivote
+            for c, x in fila_pivote.items():
+                if c == j:
+                    continue
+                nuevo = fila_r.get(c, 0) - factor * x
+                if nuevo != 0:
+                    fila_r[c] = nuevo
+                    if c < columnas_pivote:
+                        columnas[c].add(r)
+                else:
+                    fila_r.pop(c, None)
+                    if c < columnas_pivote:
+                        columnas[c].discard(r)
+            heapq.heappush(monticulo, (len(fila_r), r))
+
+        if _instrumentacion is not None:
+            operaciones = len(columnas[j]) * (1 + 2 * (len(fila_pivote) - 1))
+            _instrumentacion.contar(operaciones, operaciones)
+            _instrumentacion.registrar_paso("eliminacion_markowitz", len(pivotes) + 1,
+                                            chain.from_iterable(filas[r].values() for r in columnas[j]))
+        columnas[j].clear()
+        pivotes.append((i, j))
+
+    return pivotes
+
+
+def _determinante_disperso(matriz):
+    n = matriz['filas']
+    filas = [dict(fila) for fila in matriz['entradas']]
+    pivotes = _eliminar_markowitz(filas, n)
+    if pivotes is None or len(pivotes) < n:
+        return Fraction(0)
+    permutacion = [0] * n
+    determinante = Fraction(1)
+    for i, j in pivotes:
+        permutacion[i] = j
+        determinante *= filas[i][j]
+    return _signo_permutacion(permutacion) * determinante
+
+
+def _resolver_disperso(matriz_aumentada):
+    # Resuelve [A | b] con A cuadrada; devuelve las soluciones y det(A), o None si A es singular
+    n = matriz_aumentada['filas']
+    filas = [dict(fila) for fila in matriz_aumentada['entradas']]
+    pivotes = _eliminar_markowitz(filas, n)
+    if pivotes is None or len(pivotes) < n:
+        return None, Fraction(0)
+
+    soluciones = [Fraction(0)] * n
+    permutacion = [0] * n
+    determinante = Fraction(1)
+    for i, j in reversed(pivotes):
+        fila = filas[i]
+        total = fila.get(n, Fraction(0))
+        for c, x in fila.items():
+            if c != j and c < n:
+                total -= x * soluciones[c]
+        soluciones[j] = total / fila[j]
+        permutacion[i] = j
+        determinante *= fila[j]
+    return soluciones, _signo_permutacion(permutacion) * determinante
+
+
+@_instrumentado("lectura")
+def input_matriz_dispersa(filas, columnas):
+    print("Ingrese los elementos no nulos como 'fila columna valor' (ejemplo: 1 3 2.5). Deje la línea vacía para terminar.")
+    entradas = {}
+    while True:
+        linea = input("Elemento: ").split()
+        if not linea:
+            return nueva_matriz_dispersa(filas, columnas, entradas)
+        try:
+            if len(linea) != 3:
+                raise ValueError
+            i, j, valor = int(linea[0]), int(linea[1]), parsear_numero(linea[2], limite_denominador_sesion)
+            if not (1 <= i <= filas and 1 <= j <= columnas):
+                raise ValueError
+            entradas[(i - 1, j - 1)] = valor
+        except (ValueError, IndexError):
+            print("Formato no válido")
+
+
+######################################################
+################# Archivos de Matrices ###############
+######################################################
+
+# Formatos según la extensión: .npy (numpy, datos en coma flotante o enteros), .mfr (binario exacto de
+# numeradores y denominadores) y cualquier otra extensión como texto con una fila por línea
+EXTENSION_NUMPY = ".npy"
+EXTENSION_BINARIA = ".mfr"
+
+# Cabecera del formato binario: firma, codificación, filas y columnas
+_CABECERA_BINARIA = struct.Struct("<4sBQQ")
+FIRMA_BINARIA = b"MFRC"
+# Numeradores y denominadores en dos arreglos int64 contiguos, accesibles directamente desde el mapa de memoria
+CODIFICACION_INT64 = 1
+# Cada valor con su longitud en bytes; una tabla de desplazamientos al final permite ubicar cada fila
+CODIFICACION_VARIABLE = 2
+_LONGITUD_VALOR = struct.Struct("<I")
+_DESPLAZAMIENTO = struct.Struct("<Q")
+
+
+def _es_ruta(valor):
+    return isinstance(valor, (str, os.PathLike))
+
+
+def _iterar_filas(matriz):
+    # Filas de Fraction sin materializar la matriz completa cuando viene de un archivo mapeado
+    if isinstance(matriz, MatrizMapeada):
+        return iter(matriz)
+    if isinstance(matriz, Matriz):
+        return matriz.iterar_filas()
+    return a_densa(matriz)['datos']
+
+
+def _con_archivos(cantidad, mapear=False):
+    # Permite pasar la ruta de un archivo en lugar de las primeras `cantidad` matrices. Con mapear=True
+    # los .mfr se recorren fila a fila desde el mapa de memoria, que se cierra al terminar la función
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not any(_es_ruta(x) for x in args[:cantidad]):
+                return funcion(*args, **kwargs)
+            args = list(args)
+            abiertas = []
+            try:
+                for i, x in enumerate(args[:cantidad]):
+                    if _es_ruta(x):
+                        args[i] = cargar_matriz(x, mapear=mapear)
+                        if isinstance(args[i], MatrizMapeada):
+                            abiertas.append(args[i])
+                return funcion(*args, **kwargs)
+            finally:
+                for mapeada in abiertas:
+                    mapeada.cerrar()
+        return envoltura
+    return decorador
+
+
+def _abrir_operandos(operandos):
+    # Recorre los operandos abriendo las rutas mapeadas; cada archivo se cierra cuando se pide el
+    # siguiente operando, es decir, en cuanto el anterior ya se acumuló
+    for operando in operandos:
+        if not _es_ruta(operando):
+            yield operando
+            continue
+        operando = cargar_matriz(operando, mapear=True)
+        with operando if isinstance(operando, MatrizMapeada) else nullcontext():
+            yield operando
+
+
+class MatrizMapeada:
+    # Matriz de un archivo .mfr abierta con mmap: las filas se decodifican a medida que se recorren
+    def __init__(self, ruta):
+        self.ruta = os.fspath(ruta)
+        self._archivo = open(self.ruta, "rb")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._archivo.close()
+            raise ValueError(f"El archivo {self.ruta} está vacío")
+        if len(self._mapa) < _CABECERA_BINARIA.size:
+            self.cerrar()
+            raise ValueError(f"El archivo {self.ruta} no es una matriz binaria válida")
+        firma, self.codificacion, self.filas, self.columnas = _CABECERA_BINARIA.unpack_from(self._mapa)
+        if (firma != FIRMA_BINARIA or self.codificacion not in (CODIFICACION_INT64, CODIFICACION_VARIABLE)
+                or self.filas == 0 or self.columnas == 0):
+            self.cerrar()
+            raise ValueError(f"El archivo {self.ruta} no es una matriz binaria válida")
+        try:
+            self._abrir_datos()
+        except ValueError:
+            self.cerrar()
+            raise
+
+    def _abrir_datos(self):
+        # Comprueba que el tamaño del archivo coincida con la cabecera antes de exponer sus filas
+        inicio = _CABECERA_BINARIA.size
+        tamano = len(self._mapa)
+        if self.codificacion == CODIFICACION_INT64:
+            elementos = self.filas * self.columnas
+            if tamano != inicio + 16 * elementos:
+                raise ValueError(f"El archivo {self.ruta} no tiene el tamaño que indica su cabecera "
+                                 f"({self.filas}x{self.columnas})")
+            valores = memoryview(self._mapa)[inicio:inicio + 16 * elementos].cast('q')
+            if sys.byteorder != "little":
+                # El archivo siempre es little-endian; en otras máquinas se copia e invierte una sola vez
+                copia = array('q', valores)
+                copia.byteswap()
+                valores.release()
+                valores = copia
+            self._valores = valores
+        else:
+            largo_tabla = _DESPLAZAMIENTO.size * (self.filas + 1)
+            if tamano < inicio + largo_tabla + _DESPLAZAMIENTO.size:
+                raise ValueError(f"El archivo {self.ruta} está truncado")
+            (tabla,) = _DESPLAZAMIENTO.unpack_from(self._mapa, tamano - _DESPLAZAMIENTO.size)
+            if tabla + largo_tabla + _DESPLAZAMIENTO.size != tamano:
+                raise ValueError(f"El archivo {self.ruta} tiene una tabla de filas no válida")
+            self._desplazamientos = memoryview(self._mapa)[tabla:tabla + largo_tabla].cast('Q')
+            # Cada fila empieza donde termina la anterior y la última termina donde empieza la tabla
+            desplazamientos = self._desplazamientos
+            if desplazamientos[0] != inicio or desplazamientos[self.filas] != tabla or any(
+                    desplazamientos[i] > desplazamientos[i + 1] for i in range(self.filas)):
+                raise ValueError(f"El archivo {self.ruta} tiene una tabla de filas no válida")
+
+    def fila(self, i):
+        if not 0 <= i < self.filas:
+            raise IndexError("Fila fuera de la matriz")
+        c = self.columnas
+        if self.codificacion == CODIFICACION_INT64:
+            inicio = i * c
+            elementos = self.filas * c
+            # tolist() copia los valores: ninguna vista del mapa queda viva fuera de este método
+            numeradores = self._valores[inicio:inicio + c].tolist()
+            denominadores = self._valores[elementos + inicio:elementos + inicio + c].tolist()
+            try:
+                return [Fraction(n, d) for n, d in zip(numeradores, denominadores)]
+            except ZeroDivisionError:
+                raise ValueError(f"El archivo {self.ruta} tiene la fila {i + 1} dañada")
+
+        posicion = self._desplazamientos[i]
+        fin = self._desplazamientos[i + 1]
+        mapa = self._mapa
+        fila = []
+        try:
+            for _ in range(c):
+                numero = []
+                for _ in range(2):
+                    (largo,) = _LONGITUD_VALOR.unpack_from(mapa, posicion)
+                    posicion += _LONGITUD_VALOR.size
+                    numero.append(int.from_bytes(mapa[posicion:posicion + largo], "little", signed=True))
+                    posicion += largo
+                fila.append(Fraction(numero[0], numero[1]))
+        except (struct.error, ZeroDivisionError):
+            posicion = None
+        if posicion != fin:
+            raise ValueError(f"El archivo {self.ruta} tiene la fila {i + 1} dañada")
+        return fila
+
+    def __iter__(self):
+        for i in range(self.filas):
+            yield self.fila(i)
+
+    def __getitem__(self, clave):
+        # Compatibilidad con las funciones que reciben el diccionario de nueva_matriz
+        if clave == 'filas':
+            return self.filas
+        if clave == 'columnas':
+            return self.columnas
+        if clave == 'datos':
+            return list(self)
+        i, j = clave
+        return self.fila(i)[j]
+
+    def a_dict(self):
+        return {'filas': self.filas, 'columnas': self.columnas, 'datos': list(self)}
+
+    def cerrar(self):
+        if getattr(self, '_valores', None) is not None and isinstance(self._valores, memoryview):
+            self._valores.release()
+        if getattr(self, '_desplazamientos', None) is not None:
+            self._desplazamientos.release()
+        if getattr(self, '_mapa', None) is not None:
+            self._mapa.close()
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def __repr__(self):
+        return f"MatrizMapeada({self.ruta!r}, {self.filas}x{self.columnas})"
+
+
+def _guardar_binaria(archivo, matriz):
+    filas = matriz['filas']
+    columnas = matriz['columnas']
+    numeradores = array('q')
+    denominadores = array('q')
+    try:
+        for fila in _iterar_filas(matriz):
+            for x in fila:
+                x = x if type(x) is Fraction else Fraction(x)
+                numeradores.append(x.numerator)
+                denominadores.append(x.denominator)
+    except OverflowError:
+        numeradores = None
+
+    if numeradores is not None:
+        archivo.write(_CABECERA_BINARIA.pack(FIRMA_BINARIA, CODIFICACION_INT64, filas, columnas))
+        if sys.byteorder != "little":
+            numeradores.byteswap()
+            denominadores.byteswap()
+        numeradores.tofile(archivo)
+        denominadores.tofile(archivo)
+        return
+
+    # Algún valor no cabe en 64 bits: cada número se escribe con su propia longitud
+    archivo.write(_CABECERA_BINARIA.pack(FIRMA_BINARIA, CODIFICACION_VARIABLE, filas, columnas))
+    posicion = _CABECERA_BINARIA.size
+    desplazamientos = array('Q', [posicion])
+    for fila in _iterar_filas(matriz):
+        partes = []
+        for x in fila:
+            x = x if type(x) is Fraction else Fraction(x)
+            for n in (x.numerator, x.denominator):
+                datos = n.to_bytes(n.bit_length() // 8 + 1, "little", signed=True)
+                partes.append(_LONGITUD_VALOR.pack(len(datos)))
+                partes.append(datos)
+        bloque = b"".join(partes)
+        archivo.write(bloque)
+        posicion += len(bloque)
+        desplazamientos.append(posicion)
+    if sys.byteorder != "little":
+        desplazamientos.byteswap()
+    desplazamientos.tofile(archivo)
+    archivo.write(_DESPLAZAMIENTO.pack(posicion))
+
+
+def _numero_desde_numpy(x):
+    # Los flotantes se toman por su representación decimal más corta, igual que al teclearlos
+    if isinstance(x, float):
+        return Fraction(repr(x))
+    return Fraction(x)
+
+
+def guardar_matriz(ruta, matriz):
+    ruta = os.fspath(ruta)
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == EXTENSION_NUMPY:
+        if np is None:
+            raise ValueError("Se necesita numpy para guardar archivos .npy")
+        # Las entradas flotantes (resultados del backend numpy) van directo a float64; el resto, como Fraction
+        datos = [[x if isinstance(x, float) else Fraction(x) for x in fila] for fila in _iterar_filas(matriz)]
+        if all(isinstance(x, Fraction) and x.denominator == 1 and -MAXIMO_INT64 <= x.numerator <= MAXIMO_INT64 for fila in datos for x in fila):
+            arreglo = np.array([[x.numerator for x in fila] for fila in datos], dtype=np.int64)
+        else:
+            arreglo = np.array([[float(x) for x in fila] for fila in datos], dtype=np.float64)
+        np.save(ruta, arreglo.reshape(matriz['filas'], matriz['columnas']))
+    elif extension == EXTENSION_BINARIA:
+        with open(ruta, "wb") as archivo:
+            _guardar_binaria(archivo, matriz)
+    else:
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(f"# {matriz['filas']} {matriz['columnas']}\n")
+            for fila in _iterar_filas(matriz):
+                archivo.write(' '.join(map(str, fila)) + "\n")
+
+
+def cargar_matriz(ruta, mapear=False, limite_denominador=None):
+    # Con mapear=True los archivos .mfr devuelven una MatrizMapeada en lugar de leerse completos
+    ruta = os.fspath(ruta)
+    if not os.path.isfile(ruta):
+        raise ValueError(f"No existe el archivo {ruta}")
+    extension = os.path.splitext(ruta)[1].lower()
+
+    if extension == EXTENSION_NUMPY:
+        if np is None:
+            raise ValueError("Se necesita numpy para leer archivos .npy")
+        arreglo = np.load(ruta, mmap_mode="r" if mapear else None, allow_pickle=False)
+        if arreglo.ndim != 2 or arreglo.dtype.kind not in "biuf":
+            raise ValueError("El archivo .npy debe contener una matriz numérica de dos dimensiones")
+        filas, columnas = arreglo.shape
+        datos = []
+        for fila in arreglo:
+            datos.append([_numero_desde_numpy(x) for x in fila.tolist()])
+        return nueva_matriz(filas, columnas, datos)
+
+    if extension == EXTENSION_BINARIA:
+        mapeada = MatrizMapeada(ruta)
+        if mapear:
+            return mapeada
+        with mapeada:
+            return nueva_matriz(mapeada.filas, mapeada.columnas, mapeada)
+
+    datos = []
+    columnas = None
+    with open(ruta, encoding="utf-8") as archivo:
+        for numero, linea in enumerate(archivo, 1):
+            linea = linea.strip()
+            if not linea or linea.startswith('#'):
+                continue
+            # Los mensajes no repiten el contenido del archivo: el servidor los devuelve a sus clientes
+            elementos = linea.split()
+            if columnas is not None and len(elementos) != columnas:
+                raise ValueError(f"{ruta}, línea {numero}: se esperaban {columnas} números")
+            fila = []
+            for k, elemento in enumerate(elementos, 1):
+                try:
+                    fila.append(parsear_numero(elemento, limite_denominador))
+                except ValueError:
+                    raise ValueError(f"{ruta}, línea {numero}, elemento {k}: no es un número válido")
+            columnas = len(fila)
+            datos.append(fila)
+    if not datos:
+        raise ValueError(f"El archivo {ruta} no contiene ninguna matriz")
+    return nueva_matriz(len(datos), columnas, datos)
+
+
+######################################################
+################# Caché de Resultados ################
+######################################################
+
+# Las matrices con menos filas se calculan más rápido de lo que cuesta buscarlas en la caché
+FILAS_MINIMAS_CACHE = 4
+# Formato del archivo de caché: JSON con las entradas ya serializadas
+VERSION_ARCHIVO_CACHE = 1
+
+
+class CacheResultados:
+    # Caché LRU de determinantes, factorizaciones e inversas indexada por el contenido de la matriz
+    def __init__(self, memoria_maxima=64 * 1024 * 1024, archivo=None):
+        self.memoria_maxima = memoria_maxima
+        self.archivo = archivo
+        self.activa = True
+        self._entradas = OrderedDict()
+        self.memoria_usada = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def obtener(self, clave):
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return _valor_desde_cache(json.loads(entrada))
+
+    def guardar(self, clave, valor):
+        # Se guarda serializado: así se conoce su tamaño y cada acierto devuelve una copia independiente.
+        # Es JSON y no pickle para que leer un archivo de caché nunca pueda ejecutar código
+        datos = json.dumps(valor, default=_valor_a_cache, separators=(',', ':'))
+        if len(datos) > self.memoria_maxima:
+            return
+        anterior = self._entradas.pop(clave, None)
+        if anterior is not None:
+            self.memoria_usada -= len(anterior)
+        self._entradas[clave] = datos
+        self.memoria_usada += len(datos)
+        self._recortar()
+
+    def _recortar(self):
+        while self.memoria_usada > self.memoria_maxima and self._entradas:
+            _, datos = self._entradas.popitem(last=False)
+            self.memoria_usada -= len(datos)
+            self.expulsiones += 1
+
+    def limpiar(self):
+        self._entradas.clear()
+        self.memoria_usada = 0
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            'entradas': len(self._entradas),
+            'memoria_usada': self.memoria_usada,
+            'memoria_maxima': self.memoria_maxima,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'expulsiones': self.expulsiones,
+            'tasa_aciertos': self.aciertos / consultas if consultas else 0.0
+        }
+
+    def guardar_archivo(self, ruta=None):
+        ruta = ruta or self.archivo
+        if ruta is None:
+            raise ValueError("No se indicó un archivo para guardar la caché")
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump({'version': VERSION_ARCHIVO_CACHE, 'entradas': list(self._entradas.items())}, archivo)
+
+    def cargar_archivo(self, ruta=None):
+        ruta = ruta or self.archivo
+        if ruta is None or not os.path.exists(ruta):
+            return
+        try:
+            with open(ruta, encoding="utf-8") as archivo:
+                contenido = json.load(archivo)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ValueError(f"El archivo de caché {ruta} no es válido")
+        if (not isinstance(contenido, dict) or contenido.get('version') != VERSION_ARCHIVO_CACHE
+                or not isinstance(contenido.get('entradas'), list)
+                or not all(isinstance(entrada, list) and len(entrada) == 2
+                           and all(isinstance(x, str) for x in entrada) for entrada in contenido['entradas'])):
+            raise ValueError(f"El archivo de caché {ruta} no es válido")
+        for clave, datos in contenido['entradas']:
+            self._entradas[clave] = datos
+            self.memoria_usada += len(datos)
+        self._recortar()
+
+
+def _valor_a_cache(valor):
+    # Las fracciones se guardan como texto ("p/q"); la caché no guarda otros textos, así que al leer
+    # cada texto vuelve a ser una Fraction
+    if isinstance(valor, Fraction):
+        return str(valor)
+    if isinstance(valor, (Matriz, VistaMatriz)):
+        return valor.como_listas()
+    raise TypeError(f"No se puede guardar en la caché un valor de tipo {type(valor).__name__}")
+
+
+def _valor_desde_cache(valor):
+    if isinstance(valor, str):
+        return Fraction(valor)
+    if isinstance(valor, list):
+        return [_valor_desde_cache(x) for x in valor]
+    if isinstance(valor, dict):
+        return {clave: _valor_desde_cache(x) for clave, x in valor.items()}
+    return valor
+
+
+cache_resultados = CacheResultados()
+
+
+def configurar_cache(memoria_maxima=None, archivo=None, activa=None):
+    if memoria_maxima is not None:
+        if memoria_maxima <= 0:
+            raise ValueError("La memoria de la caché debe ser positiva")
+        cache_resultados.memoria_maxima = memoria_maxima
+        cache_resultados._recortar()
+    if archivo is not None:
+        cache_resultados.archivo = archivo
+        cache_resultados.cargar_archivo()
+    if activa is not None:
+        cache_resultados.activa = activa
+
+
+def estadisticas_cache():
+    return cache_resultados.estadisticas()
+
+
+def _clave_cache(operacion, matriz):
+    if not cache_resultados.activa or matriz['filas'] < FILAS_MINIMAS_CACHE:
+        return None
+    # Forma canónica: los elementos no nulos de cada fila con su columna, igual para una matriz densa
+    # que para su versión dispersa, así la misma matriz da la misma clave en ambas representaciones
+    resumen = hashlib.blake2b(f"{operacion}:{matriz['filas']}x{matriz['columnas']}".encode(), digest_size=20)
+    if _es_dispersa(matriz):
+        filas = (sorted((j, x) for j, x in fila.items() if x != 0) for fila in matriz['entradas'])
+    else:
+        filas = ([(j, x) for j, x in enumerate(fila) if x != 0] for fila in _iterar_filas(matriz))
+    for fila in filas:
+        resumen.update(b";")
+        resumen.update(','.join(f"{j}={x}" for j, x in fila).encode())
+    return resumen.hexdigest()
+
+
 ######################################################
 ################ Funciones Algebraicas ###############
 ######################################################
 
-def sumar_matrices(matriz1, matriz2):
+# Niveles de explicación: sin pasos, un resumen corto o el paso a paso completo
+EXPLICACION_NINGUNA = "ninguna"
+EXPLICACION_RESUMEN = "resumen"
+EXPLICACION_COMPLETA = "completa"
+NIVELES_EXPLICACION = (EXPLICACION_NINGUNA, EXPLICACION_RESUMEN, EXPLICACION_COMPLETA)
+
+
+def _validar_explicacion(explicacion):
+    if explicacion not in NIVELES_EXPLICACION:
+        raise ValueError(f"Nivel de explicación no reconocido. Use uno de: {', '.join(NIVELES_EXPLICACION)}")
+
+
+def _combinar_enteras(matriz1, matriz2, combinar):
+    # Suma o resta fila a fila sobre numeradores enteros con un denominador común por fila
+    filas1, escalas1 = _filas_enteras_de(matriz1)
+    filas2, escalas2 = _filas_enteras_de(matriz2)
+    filas = []
+    escalas = []
+    for fila1, d1, fila2, d2 in zip(filas1, escalas1, filas2, escalas2):
+        comun = lcm(d1, d2)
+        if d1 != comun:
+            fila1 = [x * (comun // d1) for x in fila1]
+        if d2 != comun:
+            fila2 = [x * (comun // d2) for x in fila2]
+        filas.append(list(map(combinar, fila1, fila2)))
+        escalas.append(comun)
+    return Matriz.desde_filas_enteras(filas, escalas, matriz1['columnas'])
+
+
+@_instrumentado()
+@_con_archivos(2)
+def sumar_matrices(matriz1, matriz2, backend=None):
     if matriz1['filas'] != matriz2['filas'] or matriz1['columnas'] != matriz2['columnas']:
         raise ValueError("Matrices deben tener las mismas dimensiones")
 
-    resultado = [
-        [matriz1['datos'][i][j] + matriz2['datos'][i][j] for j in range(matriz1['columnas'])]
-        for i in range(matriz1['filas'])
-    ]
-    return nueva_matriz(matriz1['filas'], matriz1['columnas'], resultado)
+    backend = _obtener_backend(backend)
+    if backend is not None:
+        return backend.sumar(a_densa(matriz1), a_densa(matriz2))
+    if _es_dispersa(matriz1) or _es_dispersa(matriz2):
+        return _combinar_dispersas(a_dispersa(matriz1), a_dispersa(matriz2), 1)
+
+    resultado = _combinar_enteras(matriz1, matriz2, add)
+    if _instrumentacion is not None:
+        _instrumentacion.contar(matriz1['filas'] * matriz1['columnas'])
+    return resultado
 
 
-def restar_matrices(matriz1, matriz2):
+@_instrumentado()
+@_con_archivos(2)
+def restar_matrices(matriz1, matriz2, backend=None):
     if matriz1['filas'] != matriz2['filas'] or matriz1['columnas'] != matriz2['columnas']:
         raise ValueError("Matrices deben tener las mismas dimensiones")
 
-    resultado = [
-        [matriz1['datos'][i][j] - matriz2['datos'][i][j] for j in range(matriz1['columnas'])]
-        for i in range(matriz1['filas'])
-    ]
-    return nueva_matriz(matriz1['filas'], matriz1['columnas'], resultado)
+    backend = _obtener_backend(backend)
+    if backend is not None:
+        return backend.restar(a_densa(matriz1), a_densa(matriz2))
+    if _es_dispersa(matriz1) or _es_dispersa(matriz2):
+        return _combinar_dispersas(a_dispersa(matriz1), a_dispersa(matriz2), -1)
+
+    resultado = _combinar_enteras(matriz1, matriz2, sub)
+    if _instrumentacion is not None:
+        _instrumentacion.contar(matriz1['filas'] * matriz1['columnas'])
+    return resultado
+
+
+def _acumular_fila(numeradores, denominador, fila, combinar):
+    # Acumula en el lugar sobre una fila de enteros con denominador común y devuelve el nuevo denominador.
+    # fila es la fila densa de Fraction o un dict {columna: Fraction} con sus elementos no nulos
+    valores = fila.values() if isinstance(fila, dict) else fila
+    comun = denominador
+    for x in valores:
+        if comun % x.denominator:
+            comun = lcm(comun, x.denominator)
+    if comun != denominador:
+        escala = comun // denominador
+        numeradores[:] = [x * escala for x in numeradores]
+    if isinstance(fila, dict):
+        for j, x in fila.items():
+            numeradores[j] = combinar(numeradores[j], x.numerator * (comun // x.denominator))
+    else:
+        numeradores[:] = map(combinar, numeradores, [x.numerator * (comun // x.denominator) for x in fila])
+    return comun
+
+
+def _acumular_fila_entera(numeradores, denominador, fila, denominador_fila, combinar):
+    # Igual que _acumular_fila para una fila que ya viene como enteros sobre denominador_fila
+    comun = lcm(denominador, denominador_fila)
+    if comun != denominador:
+        escala = comun // denominador
+        numeradores[:] = [x * escala for x in numeradores]
+    escala = comun // denominador_fila
+    numeradores[:] = map(combinar, numeradores, fila if escala == 1 else [x * escala for x in fila])
+    return comun
+
+
+@_instrumentado()
+def acumular_matrices(operandos, operacion="suma", backend=None, explicacion=EXPLICACION_NINGUNA, salida=print):
+    # Suma o resta una secuencia de matrices (lista, iterador o generador) sobre un único acumulador
+    # que se modifica en el lugar; cada operando se descarta en cuanto se acumula
+    if operacion not in ("suma", "resta"):
+        raise ValueError("Operación no reconocida. Use 'suma' o 'resta'")
+    _validar_explicacion(explicacion)
+    # Las rutas se abren mapeadas para recorrer sus filas sin cargarlas completas
+    operandos = _abrir_operandos(operandos)
+    try:
+        return _acumular(operandos, operacion, backend, explicacion, salida)
+    finally:
+        operandos.close()
+
+
+def _acumular(operandos, operacion, backend, explicacion, salida):
+    primero = next(operandos, None)
+    if primero is None:
+        raise ValueError("Se requiere al menos una matriz para acumular")
+
+    filas = primero['filas']
+    columnas = primero['columnas']
+    combinar = add if operacion == "suma" else sub
+    simbolo = "+" if operacion == "suma" else "-"
+    detallar = explicacion == EXPLICACION_COMPLETA
+
+    backend_elegido = _obtener_backend(backend)
+    dispersa = _es_dispersa(primero) and backend_elegido is None
+    if backend_elegido is not None:
+        # El backend opera sobre la matriz completa, que debe sobrevivir al cierre del archivo
+        if isinstance(primero, MatrizMapeada):
+            acumulado = nueva_matriz(filas, columnas, primero)
+        else:
+            acumulado = a_densa(primero)
+    elif dispersa:
+        acumulado = [dict(fila) for fila in primero['entradas']]
+    else:
+        # Cada fila densa se guarda como enteros sobre un denominador común: sumar enteros evita
+        # la reducción por mcd que Fraction hace en cada suma
+        acumulado, denominadores = _filas_enteras_de(primero)
+
+    def actual():
+        if backend_elegido is not None:
+            return acumulado
+        if dispersa:
+            return {'filas': filas, 'columnas': columnas, 'dispersa': True, 'entradas': acumulado}
+        return Matriz.desde_filas_enteras(acumulado, denominadores, columnas)
+
+    cantidad = 1
+    for operando in operandos:
+        cantidad += 1
+        if operando['filas'] != filas or operando['columnas'] != columnas:
+            raise ValueError(f"La matriz {cantidad} no tiene las mismas dimensiones que la primera")
+        anterior = matriz_string(actual()) if detallar else None
+
+        if backend_elegido is not None:
+            acumulado = (backend_elegido.sumar if operacion == "suma" else backend_elegido.restar)(
+                acumulado, a_densa(operando))
+        elif dispersa and _es_dispersa(operando):
+            for fila_acumulada, fila in zip(acumulado, operando['entradas']):
+                for j, x in fila.items():
+                    nuevo = combinar(fila_acumulada.get(j, 0), x)
+                    if nuevo != 0:
+                        fila_acumulada[j] = nuevo
+                    else:
+                        fila_acumulada.pop(j, None)
+        else:
+            if dispersa:
+                acumulado, denominadores = _filas_enteras_de(actual())
+                dispersa = False
+            if _es_dispersa(operando):
+                # Un operando disperso solo toca sus elementos no nulos
+                for i, fila in enumerate(operando['entradas']):
+                    if fila:
+                        denominadores[i] = _acumular_fila(acumulado[i], denominadores[i], fila, combinar)
+            elif isinstance(operando, Matriz):
+                for i, (fila, d) in enumerate(zip(*operando.filas_enteras())):
+                    denominadores[i] = _acumular_fila_entera(acumulado[i], denominadores[i], fila, d, combinar)
+            else:
+                for i, fila in enumerate(_iterar_filas(operando)):
+                    fila = [x if type(x) is Fraction else Fraction(x) for x in fila]
+                    denominadores[i] = _acumular_fila(acumulado[i], denominadores[i], fila, combinar)
 
+        if _instrumentacion is not None:
+            elementos = elementos_no_nulos(operando) if _es_dispersa(operando) else filas * columnas
+            _instrumentacion.contar(elementos)
+        if detallar:
+            salida(f"{anterior}\n{simbolo}\n{matriz_string(operando)}\n=\n{matriz_string(actual())}\n")
 
-def multiplicar_matrices(matriz1, matriz2):
-    if matriz1['columnas'] != matriz2['filas']:
-        raise ValueError("El número de columnas de la primera matriz deben == al numero de filas de la segunda matriz")
+    if explicacion == EXPLICACION_RESUMEN:
+        salida(f"{'Suma' if operacion == 'suma' else 'Resta'} acumulada de {cantidad} matrices de {filas}x{columnas}.")
+    return actual()
 
-    resultado = []
-    explicacion = []
 
-    for i in range(matriz1['filas']):
-        fila = []
-        for j in range(matriz2['columnas']):
-            total = 0
-            pasos = []
-            for k in range(matriz1['columnas']):
-                producto = matriz1['datos'][i][k] * matriz2['datos'][k][j]
-                total += producto
-                pasos.append(f"({matriz1['datos'][i][k]}×{matriz2['datos'][k][j]})")
-            fila.append(total)
-            explicacion.append(f"Elemento [{i + 1},{j + 1}]: {' + '.join(pasos)} = {total}")
-        resultado.append(fila)
+def _pasos_multiplicacion(datos1, datos2, resultado):
+    # Generador: cada elemento se explica solo cuando se consume
+    for i, fila in enumerate(datos1):
+        for j, total in enumerate(resultado[i]):
+            pasos = ' + '.join(f"({fila[k]}×{datos2[k][j]})" for k in range(len(fila)))
+            yield f"Elemento [{i + 1},{j + 1}]: {pasos} = {total}"
 
-    return nueva_matriz(matriz1['filas'], matriz2['columnas'], resultado), explicacion
 
+@_instrumentado()
+@_con_archivos(2)
+def multiplicar_matrices(matriz1, matriz2, backend=None, explicacion=EXPLICACION_NINGUNA, metodo="auto",
+                         procesos=None):
+    if matriz1['columnas'] != matriz2['filas']:
+        raise ValueError("El número de columnas de la primera matriz deben == al numero de filas de la segunda matriz")
+    _validar_explicacion(explicacion)
+
+    backend = _obtener_backend(backend)
+    if backend is not None:
+        return backend.multiplicar(a_densa(matriz1), a_densa(matriz2))
+    if _es_dispersa(matriz1) or _es_dispersa(matriz2):
+        producto = _multiplicar_dispersas(a_dispersa(matriz1), a_dispersa(matriz2))
+        if explicacion == EXPLICACION_NINGUNA:
+            return producto, []
+        return producto, [f"Producto disperso: {elementos_no_nulos(producto)} elementos no nulos en el resultado"]
+
+    m, k, p = matriz1['filas'], matriz1['columnas'], matriz2['columnas']
+
+    if metodo == "auto":
+        if m * k * p >= UMBRAL_PARALELO and (procesos or os.cpu_count() or 1) > 1:
+            metodo = "paralelo"
+        elif min(m, k, p) > UMBRAL_STRASSEN:
+            metodo = "strassen"
+        else:
+            metodo = "bloques"
+
+    if metodo == "ingenuo":
+        columnas = list(zip(*_iterar_filas(matriz2)))
+        producto = nueva_matriz(m, p, [[sum(map(mul, fila, columna)) for columna in columnas]
+                                       for fila in _iterar_filas(matriz1)])
+    elif metodo in ("bloques", "strassen", "paralelo"):
+        # Filas de A y columnas de B escaladas a enteros: c_ij = (a_i · b_j) / (d_i · e_j)
+        filas_a, escalas_a = _filas_enteras_de(matriz1)
+        if isinstance(matriz2, Matriz):
+            columnas_b, escalas_b = matriz2.columnas_enteras()
+        else:
+            columnas_b, escalas_b = _filas_enteras(list(zip(*_iterar_filas(matriz2))))
+        if metodo == "bloques":
+            enteros = _producto_bloques(filas_a, columnas_b)
+        elif metodo == "strassen":
+            enteros = _producto_strassen(filas_a, [list(fila) for fila in zip(*columnas_b)])
+        else:
+            enteros = _producto_paralelo(filas_a, columnas_b, procesos)
+        if all(e == escalas_b[0] for e in escalas_b):
+            # Con un mismo denominador por columna de B el resultado se guarda sin formar ningún Fraction
+            producto = Matriz.desde_filas_enteras(enteros, [d * escalas_b[0] for d in escalas_a], p)
+        else:
+            producto = nueva_matriz(m, p, [[Fraction(c, d * e) for c, e in zip(fila, escalas_b)]
+                                           for fila, d in zip(enteros, escalas_a)])
+    else:
+        raise ValueError("Método no reconocido. Use 'auto', 'ingenuo', 'bloques', 'strassen' o 'paralelo'")
+
+    if _instrumentacion is not None:
+        # Los núcleos enteros no reducen por mcd: el resultado guarda numeradores con un denominador común
+        _instrumentacion.contar(2 * m * k * p, 2 * m * k * p if metodo == "ingenuo" else 0)
+        _instrumentacion.registrar_paso("multiplicar_matrices", 1, chain.from_iterable(producto.iterar_filas()))
+
+    if explicacion == EXPLICACION_COMPLETA:
+        return producto, _pasos_multiplicacion(matriz1['datos'], matriz2['datos'], producto['datos'])
+    if explicacion == EXPLICACION_RESUMEN:
+        return producto, [f"Producto de una matriz {matriz1['filas']}x{matriz1['columnas']} por una "
+                          f"{matriz2['filas']}x{matriz2['columnas']}: "
+                          f"{matriz1['filas'] * matriz2['columnas'] * matriz1['columnas']} productos escalares"]
+    return producto, []
+
+
+@_instrumentado()
+@_con_archivos(1, mapear=True)
+def multiplicar_matrices_escalar(matriz, escalar, backend=None):
+    backend = _obtener_backend(backend)
+    if backend is not None:
+        return backend.multiplicar_escalar(a_densa(matriz), escalar)
+    if _es_dispersa(matriz):
+        return _escalar_dispersa(matriz, escalar)
+
+    if isinstance(escalar, (int, Fraction)):
+        # Sobre los numeradores enteros basta multiplicar por el numerador del escalar y dividir la escala.
+        # Las filas se convierten de a una y se guardan como arreglos de 64 bits cuando caben, así un
+        # archivo mapeado nunca se materializa como listas de Fraction
+        escalar = Fraction(escalar)
+        filas = []
+        escalas = []
+        for fila, d in _iterar_filas_enteras(matriz):
+            fila = [x * escalar.numerator for x in fila]
+            try:
+                fila = array('q', fila)
+            except OverflowError:
+                pass
+            filas.append(fila)
+            escalas.append(d * escalar.denominator)
+        return Matriz.desde_filas_enteras(filas, escalas, matriz['columnas'])
 
-def multiplicar_matrices_escalar(matriz, escalar):
     resultado = [
         [element * escalar for element in fila]
-        for fila in matriz['datos']
+        for fila in _iterar_filas(matriz)
     ]
     return nueva_matriz(matriz['filas'], matriz['columnas'], resultado)
 
 
-def calcular_determinante(matriz):
-    if matriz['filas'] != matriz['columnas']:
-        raise ValueError("El determinante solo se puede calcular para matrices cuadradas")
+def _es_escalar(operando):
+    return isinstance(operando, Number)
+
+
+@_instrumentado()
+def planificar_producto(operandos):
+    # Junta todos los escalares en un solo coeficiente y elige por programación dinámica
+    # el orden de asociación de las matrices que minimiza los productos escalares
+    if not operandos:
+        raise ValueError("Se requiere al menos un operando para multiplicar")
+
+    coeficiente = Fraction(1)
+    matrices = []
+    for operando in operandos:
+        if _es_escalar(operando):
+            coeficiente *= operando if type(operando) is Fraction else Fraction(operando)
+        else:
+            matrices.append(operando)
+
+    for izquierda, derecha in zip(matrices, matrices[1:]):
+        if izquierda['columnas'] != derecha['filas']:
+            raise ValueError("El número de columnas de la primera matriz deben == al numero de filas de la segunda matriz")
+
+    # Costo de evaluar los operandos de izquierda a derecha, como se hacía antes
+    costo_secuencial = 0
+    forma = None if _es_escalar(operandos[0]) else (operandos[0]['filas'], operandos[0]['columnas'])
+    for operando in operandos[1:]:
+        if _es_escalar(operando):
+            costo_secuencial += 1 if forma is None else forma[0] * forma[1]
+        elif forma is None:
+            costo_secuencial += operando['filas'] * operando['columnas']
+            forma = (operando['filas'], operando['columnas'])
+        else:
+            costo_secuencial += forma[0] * forma[1] * operando['columnas']
+            forma = (forma[0], operando['columnas'])
+
+    k = len(matrices)
+    dimensiones = [matrices[0]['filas']] + [m['columnas'] for m in matrices] if matrices else []
+    costo = [[0] * k for _ in range(k)]
+    corte = [[0] * k for _ in range(k)]
+    for largo in range(2, k + 1):
+        for i in range(k - largo + 1):
+            j = i + largo - 1
+            costo[i][j] = None
+            for c in range(i, j):
+                candidato = costo[i][c] + costo[c + 1][j] + dimensiones[i] * dimensiones[c + 1] * dimensiones[j + 1]
+                if costo[i][j] is None or candidato < costo[i][j]:
+                    costo[i][j] = candidato
+                    corte[i][j] = c
+
+    # El coeficiente se aplica una sola vez, sobre el nodo del árbol de productos (una matriz, un producto
+    # intermedio o el resultado) que resulte más barato. con_coeficiente[i][j] es el costo del tramo i..j con
+    # el coeficiente aplicado dentro de él, y ubicacion[i][j] dice dónde: None sobre el propio tramo, o el
+    # corte y si va en la mitad izquierda. El orden de izquierda a derecha es uno de los árboles
+    # considerados, así que el plan nunca cuesta más que él
+    escalares = len(operandos) - k
+    costo_optimo = max(escalares - 1, 0) + (costo[0][k - 1] if k else 0)
+    aplicar_en = None
+    if k and coeficiente != 1:
+        con_coeficiente = [[0] * k for _ in range(k)]
+        ubicacion = [[None] * k for _ in range(k)]
+        for largo in range(1, k + 1):
+            for i in range(k - largo + 1):
+                j = i + largo - 1
+                mejor = costo[i][j] + dimensiones[i] * dimensiones[j + 1]
+                for c in range(i, j):
+                    producto = dimensiones[i] * dimensiones[c + 1] * dimensiones[j + 1]
+                    for izquierda, candidato in ((True, con_coeficiente[i][c] + costo[c + 1][j]),
+                                                 (False, costo[i][c] + con_coeficiente[c + 1][j])):
+                        if candidato + producto < mejor:
+                            mejor = candidato + producto
+                            ubicacion[i][j] = (c, izquierda)
+                con_coeficiente[i][j] = mejor
+
+        # Los tramos que contienen al coeficiente se cortan según su propio óptimo
+        i, j = 0, k - 1
+        while ubicacion[i][j] is not None:
+            c, izquierda = ubicacion[i][j]
+            corte[i][j] = c
+            i, j = (i, c) if izquierda else (c + 1, j)
+        aplicar_en = (i, j)
+        costo_optimo += con_coeficiente[0][k - 1] - costo[0][k - 1]
+
+    return {
+        'coeficiente': coeficiente,
+        'matrices': matrices,
+        'corte': corte,
+        'aplicar_coeficiente_en': aplicar_en,
+        'costo_optimo': costo_optimo,
+        'costo_secuencial': costo_secuencial
+    }
+
+
+def orden_producto(plan):
+    corte = plan['corte']
+
+    def texto(i, j):
+        if i == j:
+            return f"M{i + 1}"
+        return f"({texto(i, corte[i][j])} {texto(corte[i][j] + 1, j)})"
+
+    orden = texto(0, len(plan['matrices']) - 1) if plan['matrices'] else ""
+    if plan['coeficiente'] != 1 or not orden:
+        orden = f"{plan['coeficiente']} · {orden}" if orden else str(plan['coeficiente'])
+    return orden
+
+
+@_instrumentado()
+def multiplicar_cadena(operandos, backend=None, explicacion=EXPLICACION_NINGUNA):
+    operandos = [cargar_matriz(x) if _es_ruta(x) else x for x in operandos]
+    _validar_explicacion(explicacion)
+    plan = planificar_producto(operandos)
+    matrices = list(plan['matrices'])
+    coeficiente = plan['coeficiente']
+    detallar = explicacion == EXPLICACION_COMPLETA
+    pasos = []
 
+    if not matrices:
+        return coeficiente, [f"Producto de escalares: {coeficiente}"] if explicacion != EXPLICACION_NINGUNA else [], plan
+
+    def aplicar_coeficiente(matriz):
+        resultado = multiplicar_matrices_escalar(matriz, coeficiente, backend)
+        if detallar:
+            pasos.append([f"{matriz_string(matriz)}\n× escalar\n{coeficiente}\n=\n{matriz_string(resultado)}\n"])
+        return resultado
+
+    corte = plan['corte']
+
+    def evaluar(i, j):
+        if i == j:
+            resultado = matrices[i]
+        else:
+            izquierda = evaluar(i, corte[i][j])
+            derecha = evaluar(corte[i][j] + 1, j)
+            resultado, explicacion_producto = multiplicar_matrices(izquierda, derecha, backend, explicacion)
+            if detallar:
+                pasos.append(explicacion_producto)
+                pasos.append([f"{matriz_string(izquierda)}\n×\n{matriz_string(derecha)}\n=\n{matriz_string(resultado)}\n"])
+        if plan['aplicar_coeficiente_en'] == (i, j):
+            resultado = aplicar_coeficiente(resultado)
+        return resultado
+
+    resultado = evaluar(0, len(matrices) - 1)
+
+    if explicacion == EXPLICACION_NINGUNA:
+        return resultado, [], plan
+    resumen = [f"Orden de evaluación: {orden_producto(plan)}",
+               f"Productos escalares: {plan['costo_optimo']} (de izquierda a derecha: {plan['costo_secuencial']}, "
+               f"ahorro de {plan['costo_secuencial'] - plan['costo_optimo']})"]
+    if detallar:
+        return resultado, chain(resumen, chain.from_iterable(pasos)), plan
+    return resultado, resumen, plan
+
+
+def _escalar_filas_a_enteros(datos):
+    filas, escalas = _filas_enteras(datos)
+    escala = 1
+    for comun in escalas:
+        escala *= comun
+    return filas, escala
+
+
+def _determinante_bareiss(datos):
+    a, escala = _escalar_filas_a_enteros(datos)
+    n = len(a)
+    signo = 1
+    previo = 1
+
+    for k in range(n - 1):
+        # Elegir como pivote el valor no nulo de menor magnitud en la columna
+        candidato = None
+        for i in range(k, n):
+            if a[i][k] != 0 and (candidato is None or abs(a[i][k]) < abs(a[candidato][k])):
+                candidato = i
+        if candidato is None:
+            return Fraction(0)
+        if candidato != k:
+            a[k], a[candidato] = a[candidato], a[k]
+            signo = -signo
+            if _instrumentacion is not None:
+                _instrumentacion.intercambio()
+
+        fila_k = a[k]
+        pivote = fila_k[k]
+        for i in range(k + 1, n):
+            fila_i = a[i]
+            factor = fila_i[k]
+            for j in range(k + 1, n):
+                fila_i[j] = (fila_i[j] * pivote - factor * fila_k[j]) // previo
+        previo = pivote
+
+        if _instrumentacion is not None:
+            # Dos productos, una resta y una división exacta por entrada; los enteros no se reducen por mcd
+            _instrumentacion.contar(4 * (n - k - 1) ** 2)
+            _instrumentacion.registrar_paso("determinante_bareiss", k + 1, chain.from_iterable(a[k + 1:]))
+
+    return Fraction(signo * a[n - 1][n - 1], escala)
+
+
+def _determinante_cofactores(matriz):
     datos = matriz['datos']
     if matriz['filas'] == 1:
         return datos[0][0]
 
-    try:
-        def submatriz(datos_matriz, fila, columna):
-            return [[datos_matriz[i][j] for j in range(len(datos_matriz)) if j != columna]
-                    for i in range(len(datos_matriz)) if i != fila]
+    if _instrumentacion is not None:
+        _instrumentacion.contar(2 * matriz['columnas'], 2 * matriz['columnas'])
 
-        return sum((-1) ** c * datos[0][c] * calcular_determinante(
-            nueva_matriz(matriz['filas'] - 1, matriz['columnas'] - 1, submatriz(datos, 0, c))
-        ) for c in range(matriz['columnas']))
-    except Exception as e:
-        raise ValueError(f"Error al calcular el determinante: {e}")
+    def submatriz(datos_matriz, fila, columna):
+        return [[datos_matriz[i][j] for j in range(len(datos_matriz)) if j != columna]
+                for i in range(len(datos_matriz)) if i != fila]
+
+    return sum((-1) ** c * datos[0][c] * _determinante_cofactores(
+        nueva_matriz(matriz['filas'] - 1, matriz['columnas'] - 1, submatriz(datos, 0, c))
+    ) for c in range(matriz['columnas']))
 
 
-def calcular_inversa(matriz, metodo="adjuncion"):
+@_instrumentado()
+@_con_archivos(1, mapear=True)
+def calcular_determinante(matriz, metodo="auto", backend=None, procesos=None):
     if matriz['filas'] != matriz['columnas']:
-        raise ValueError("La inversa solo se puede calcular para matrices cuadradas")
+        raise ValueError("El determinante solo se puede calcular para matrices cuadradas")
 
-    determinante = calcular_determinante(matriz)
-    if determinante == 0:
-        raise ValueError("La matriz no tiene inversa porque su determinante es 0")
+    backend = _obtener_backend(backend)
+    if backend is not None:
+        return backend.determinante(a_densa(matriz))
 
-    pasos = []
-    datos = matriz['datos']
-    n = matriz['filas']
+    if metodo not in ("auto", "bareiss", "modular", "explicar"):
+        raise ValueError("Método no reconocido. Use 'auto', 'bareiss', 'modular' o 'explicar'")
+
+    clave = _clave_cache('determinante', matriz)
+    if clave is not None:
+        determinante = cache_resultados.obtener(clave)
+        if determinante is not None:
+            return determinante
+
+    # Las matrices dispersas usan eliminación con pivoteo de Markowitz salvo que se pida un método concreto
+    if _es_dispersa(matriz) and metodo == "auto":
+        determinante = _determinante_disperso(matriz)
+    else:
+        matriz = a_densa(matriz)
+
+        # La expansión por cofactores solo compensa en matrices muy pequeñas
+        if metodo == "auto":
+            metodo = "explicar" if matriz['filas'] <= 3 else "bareiss"
 
-    if metodo == "a":
         try:
-            adjunta = [[(-1) ** (i + j) * calcular_determinante(
-                nueva_matriz(n - 1, n - 1, [fila[:j] + fila[j + 1:] for fila in (datos[:i] + datos[i + 1:])])
-            ) for j in range(n)] for i in range(n)]
-
-            print("Paso 1: Calcular la matriz adjunta.")
-            print('\n'.join([' '.join(map(str, fila)) for fila in adjunta]))
-            print("Paso 2: Dividir cada elemento de la adjunta por el determinante.")
-            inversa = [[Fraction(adjunta[j][i], determinante) for j in range(n)] for i in range(n)]
-            return nueva_matriz(n, n, inversa)
+            if metodo == "explicar":
+                determinante = _determinante_cofactores(matriz)
+            elif metodo == "bareiss":
+                determinante = _determinante_bareiss(matriz if isinstance(matriz, Matriz) else _iterar_filas(matriz))
+            else:
+                determinante = _determinante_multimodular(matriz['datos'], procesos)
         except Exception as e:
-            raise ValueError(f"Error al calcular la inversa por adjunción: {e}")
+            raise ValueError(f"Error al calcular el determinante: {e}")
 
-    elif metodo == "g":
-        try:
-            matriz_extendida = [fila + [Fraction(1) if i == j else Fraction(0) for j in range(n)]
-                                for i, fila in enumerate(datos)]
+    if clave is not None:
+        cache_resultados.guardar(clave, determinante)
+    return determinante
 
-            pasos.append("Paso 1: Formar la matriz aumentada con la matriz identidad.")
-            pasos.append('\n'.join([' '.join(map(str, fila[:n])) + " | " + ' '.join(map(str, fila[n:]))
-                                    for fila in matriz_extendida]))
 
-            for i in range(n):
-                if matriz_extendida[i][i] == 0:
-                    raise ValueError(
-                        "No se puede calcular la inversa con el método de Gauss-Jordan debido a un pivote cero")
-
-                pivote = matriz_extendida[i][i]
-                matriz_extendida[i] = [round(x / pivote, 3) for x in matriz_extendida[i]]
-                pasos.append(f"Paso {i + 2}: Hacer el pivote {pivote} igual a 1 dividiendo la fila {i + 1}.")
-                pasos.append('\n'.join([' '.join(map(str, fila[:n])) + " | " + ' '.join(map(str, fila[n:]))
-                                        for fila in matriz_extendida]))
-
-                for j in range(n):
-                    if i != j:
-                        factor = matriz_extendida[j][i]
-                        matriz_extendida[j] = [round(matriz_extendida[j][k] - factor * matriz_extendida[i][k], 3)
-                                               for k in range(2 * n)]
-                        pasos.append(f"Reducir la fila {j + 1} usando la fila {i + 1}.")
-                        pasos.append('\n'.join([' '.join(map(str, fila[:n])) + " | " + ' '.join(map(str, fila[n:]))
-                                                for fila in matriz_extendida]))
-
-            inversa = [fila[n:] for fila in matriz_extendida]
-            pasos.append("Resultado final:")
-            pasos.append('\n'.join([' '.join(map(str, fila)) for fila in inversa]))
-            print("\n".join(pasos))
-            return nueva_matriz(n, n, inversa)
-        except Exception as e:
-            raise ValueError(f"Error al calcular la inversa por Gauss-Jordan: {e}")
+@_instrumentado()
+@_con_archivos(1)
+def factorizar_lu(matriz):
+    if matriz['filas'] != matriz['columnas']:
+        raise ValueError("La factorización LU solo se puede calcular para matrices cuadradas")
+    matriz = a_densa(matriz)
 
-    else:
-        raise ValueError("Método no reconocido. Use 'adjuncion' o 'gauss-jordan'")
+    clave = _clave_cache('lu', matriz)
+    if clave is not None:
+        factorizacion = cache_resultados.obtener(clave)
+        if factorizacion is not None:
+            return factorizacion
+
+    n = matriz['filas']
+    lu = [fila[:] for fila in matriz['datos']]
+    permutacion = list(range(n))
+    signo = 1
+    singular = False
+
+    for k in range(n):
+        candidato = next((i for i in range(k, n) if lu[i][k] != 0), None)
+        if candidato is None:
+            singular = True
+            continue
+        if candidato != k:
+            lu[k], lu[candidato] = lu[candidato], lu[k]
+            permutacion[k], permutacion[candidato] = permutacion[candidato], permutacion[k]
+            signo = -signo
+            if _instrumentacion is not None:
+                _instrumentacion.intercambio()
+
+        fila_k = lu[k]
+        pivote = fila_k[k]
+        actualizadas = 0
+        for i in range(k + 1, n):
+            fila_i = lu[i]
+            if fila_i[k] == 0:
+                continue
+            # L se guarda debajo de la diagonal y U en el resto de la matriz
+            factor = fila_i[k] / pivote
+            fila_i[k] = factor
+            for j in range(k + 1, n):
+                fila_i[j] -= factor * fila_k[j]
+            actualizadas += 1
+
+        if _instrumentacion is not None:
+            # Cada operación con Fraction termina en una reducción por mcd
+            operaciones = actualizadas * (1 + 2 * (n - k - 1))
+            _instrumentacion.contar(operaciones, operaciones)
+            _instrumentacion.registrar_paso("factorizar_lu", k + 1, chain.from_iterable(lu[k:]))
+
+    determinante = Fraction(0)
+    if not singular:
+        determinante = Fraction(signo)
+        for k in range(n):
+            determinante *= lu[k][k]
+
+    factorizacion = {
+        'n': n,
+        'lu': lu,
+        'permutacion': permutacion,
+        'signo': signo,
+        'determinante': determinante
+    }
+    if clave is not None:
+        cache_resultados.guardar(clave, factorizacion)
+        # El determinante sale gratis de la factorización
+        cache_resultados.guardar(_clave_cache('determinante', matriz), determinante)
+    return factorizacion
+
+
+def _texto_aumentada(filas, n):
+    return '\n'.join([' '.join(map(str, fila[:n])) + " | " + ' '.join(map(str, fila[n:])) for fila in filas])
+
+
+def _inversa_gauss_jordan(datos, explicacion, salida):
+    n = len(datos)
+
+    # Cada fila se escala a enteros y se guarda junto a su parte de la identidad,
+    # así [S·A | S] se reduce sin fracciones hasta [d·I | d·A^-1]
+    extendida = []
+    for i, fila in enumerate(datos):
+        comun = 1
+        for x in fila:
+            comun = lcm(comun, x.denominator)
+        extendida.append([x.numerator * (comun // x.denominator) for x in fila] +
+                         [comun if i == j else 0 for j in range(n)])
+
+    detallar = explicacion == EXPLICACION_COMPLETA
+    if detallar:
+        salida("Paso 1: Formar la matriz aumentada con la matriz identidad.")
+        salida(_texto_aumentada([fila + [1 if i == j else 0 for j in range(n)] for i, fila in enumerate(datos)], n))
+        salida("Paso 2: Multiplicar cada fila por el común denominador de sus elementos para trabajar con enteros.")
+        salida(_texto_aumentada(extendida, n))
+
+    intercambios = 0
+    previo = 1
+    for k in range(n):
+        # Buscar el pivote no nulo de menor magnitud para limitar el crecimiento de los enteros
+        candidato = None
+        for i in range(k, n):
+            if extendida[i][k] != 0 and (candidato is None or abs(extendida[i][k]) < abs(extendida[candidato][k])):
+                candidato = i
+        if candidato is None:
+            return None
+        if candidato != k:
+            extendida[k], extendida[candidato] = extendida[candidato], extendida[k]
+            intercambios += 1
+            if _instrumentacion is not None:
+                _instrumentacion.intercambio()
+            if detallar:
+                salida(f"Intercambiar fila {k + 1} con fila {candidato + 1}")
+
+        fila_k = extendida[k]
+        pivote = fila_k[k]
+        for i in range(n):
+            if i == k:
+                continue
+            fila_i = extendida[i]
+            factor = fila_i[k]
+            for j in range(k + 1, 2 * n):
+                fila_i[j] = (fila_i[j] * pivote - factor * fila_k[j]) // previo
+            fila_i[k] = 0
+            if i < k:
+                fila_i[i] = pivote
+
+        if detallar:
+            salida(f"Paso {k + 3}: Anular la columna {k + 1} con el pivote {pivote} de la fila {k + 1} "
+                   f"(fila_i = ({pivote}·fila_i - a_i{k + 1}·fila_{k + 1}) / {previo}).")
+            salida(_texto_aumentada(extendida, n))
+        previo = pivote
+
+        if _instrumentacion is not None:
+            _instrumentacion.contar(4 * (n - 1) * (2 * n - k - 1))
+            _instrumentacion.registrar_paso("inversa_gauss_jordan", k + 1, chain.from_iterable(extendida))
+
+    inversa = [[Fraction(x, previo) for x in fila[n:]] for fila in extendida]
+    if detallar:
+        salida(f"Paso {n + 3}: Dividir cada fila por {previo} para obtener la identidad a la izquierda.")
+        salida("Resultado final:")
+        salida('\n'.join([' '.join(map(str, fila)) for fila in inversa]))
+    elif explicacion == EXPLICACION_RESUMEN:
+        salida(f"Gauss-Jordan sin fracciones: {n} pivotes, {intercambios} intercambios de filas, "
+               f"divisor final {previo}.")
+    return inversa
+
+
+@_instrumentado()
+@_con_archivos(1)
+def calcular_inversa(matriz, metodo="adjuncion", explicacion=EXPLICACION_NINGUNA, backend=None, salida=print):
+    if matriz['filas'] != matriz['columnas']:
+        raise ValueError("La inversa solo se puede calcular para matrices cuadradas")
+    _validar_explicacion(explicacion)
+    matriz = a_densa(matriz)
 
+    backend = _obtener_backend(backend)
+    if backend is not None:
+        return backend.inversa(matriz)
 
-def eliminar_gauss_jordan(matriz):
+    datos = matriz['datos']
     n = matriz['filas']
-    m = matriz['columnas']
-    datos = [fila[:] for fila in matriz['datos']]
-    pasos = []
 
-    for i in range(n):
-        if datos[i][i] == 0:
-            for j in range(i + 1, n):
-                if datos[j][i] != 0:
-                    datos[i], datos[j] = datos[j], datos[i]
-                    pasos.append(f"Intercambiar fila {i + 1} con fila {j + 1}")
-                    break
-            else:
-                raise ValueError("No se puede aplicar Gauss-Jordan, pivote cero sin intercambios posibles.")
+    if metodo not in ("a", "adjuncion", "g", "gauss-jordan"):
+        raise ValueError("Método no reconocido. Use 'adjuncion' o 'gauss-jordan'")
+
+    # La inversa no depende del método; solo se consulta la caché cuando no hay que explicar los pasos
+    clave = _clave_cache('inversa', matriz)
+    if clave is not None and explicacion == EXPLICACION_NINGUNA:
+        inversa = cache_resultados.obtener(clave)
+        if inversa is not None:
+            return nueva_matriz(n, n, inversa)
+
+    if metodo in ("a", "adjuncion"):
+        # Una sola factorización da el determinante y la inversa; adj(A) = det(A) * A^-1
+        factorizacion = factorizar_lu(matriz)
+        determinante = factorizacion['determinante']
+        if determinante == 0:
+            raise ValueError("La matriz no tiene inversa porque su determinante es 0")
+
+        try:
+            identidad = nueva_matriz(n, n, [[1 if i == j else 0 for j in range(n)] for i in range(n)])
+            inversa = resolver_sistemas(matriz, identidad, factorizacion, 'fraccion')[0]['datos']
+
+            if explicacion == EXPLICACION_COMPLETA:
+                adjunta = [[determinante * inversa[j][i] for j in range(n)] for i in range(n)]
+                salida("Paso 1: Calcular la matriz adjunta.")
+                salida('\n'.join([' '.join(map(str, fila)) for fila in adjunta]))
+                salida("Paso 2: Dividir cada elemento de la adjunta por el determinante.")
+            elif explicacion == EXPLICACION_RESUMEN:
+                salida(f"Inversa por adjunción: adj(A) / det(A) con det(A) = {determinante}.")
+        except Exception as e:
+            raise ValueError(f"Error al calcular la inversa por adjunción: {e}")
+
+    else:
+        try:
+            inversa = _inversa_gauss_jordan(datos, explicacion, salida)
+        except Exception as e:
+            raise ValueError(f"Error al calcular la inversa por Gauss-Jordan: {e}")
+        if inversa is None:
+            raise ValueError("La matriz no tiene inversa porque su determinante es 0")
+
+    if clave is not None:
+        cache_resultados.guardar(clave, inversa)
+    return nueva_matriz(n, n, inversa)
+
+
+def _escalonar_enteros(filas, columnas_pivote, detallar, salida, columnas_izquierda):
+    # Gauss-Jordan sin fracciones sobre filas enteras: cada entrada se mantiene como un menor de la
+    # matriz original, por lo que la división por el pivote anterior siempre es exacta. Las columnas
+    # sin pivote se saltan. Devuelve las columnas pivote y el divisor común d de las filas pivote
+    m = len(filas)
+    ancho = len(filas[0]) if filas else 0
+    columnas = []
+    previo = 1
+    for c in range(columnas_pivote):
+        r = len(columnas)
+        if r == m:
+            break
+        # Pivote no nulo de menor magnitud para limitar el crecimiento de los enteros
+        candidato = None
+        for i in range(r, m):
+            if filas[i][c] != 0 and (candidato is None or abs(filas[i][c]) < abs(filas[candidato][c])):
+                candidato = i
+        if candidato is None:
+            continue
+        if candidato != r:
+            filas[r], filas[candidato] = filas[candidato], filas[r]
+            if _instrumentacion is not None:
+                _instrumentacion.intercambio()
+            if detallar:
+                salida(f"Intercambiar fila {r + 1} con fila {candidato + 1}")
+
+        fila_r = filas[r]
+        pivote = fila_r[c]
+        for i in range(m):
+            if i == r:
+                continue
+            fila_i = filas[i]
+            factor = fila_i[c]
+            if factor == 0 and pivote == previo:
+                continue
+            for j in range(ancho):
+                if j != c:
+                    fila_i[j] = (fila_i[j] * pivote - factor * fila_r[j]) // previo
+            fila_i[c] = 0
+        columnas.append(c)
+
+        if _instrumentacion is not None:
+            _instrumentacion.contar(4 * (m - 1) * ancho)
+            _instrumentacion.registrar_paso("forma_escalonada_reducida", r + 1, chain.from_iterable(filas))
+        if detallar:
+            salida(f"Pivote {pivote} en la fila {r + 1}, columna {c + 1}: "
+                   f"fila_i = ({pivote}·fila_i - a_i{c + 1}·fila_{r + 1}) / {previo}")
+            salida(_texto_aumentada(filas, columnas_izquierda))
+        previo = pivote
+    return columnas, previo
+
+
+@_instrumentado()
+@_con_archivos(1, mapear=True)
+def forma_escalonada_reducida(matriz, columnas_pivote=None, explicacion=EXPLICACION_NINGUNA, salida=print):
+    # Forma escalonada reducida de cualquier matriz m×n; con columnas_pivote solo se buscan pivotes en
+    # las primeras columnas (por ejemplo, para no pivotear sobre la columna de términos independientes)
+    _validar_explicacion(explicacion)
+    matriz = a_densa(matriz)
+    m = matriz['filas']
+    n = matriz['columnas']
+    if columnas_pivote is None:
+        columnas_pivote = n
+    detallar = explicacion == EXPLICACION_COMPLETA
+
+    # Las filas se convierten a enteros una por una, también al recorrer un archivo mapeado
+    filas = _filas_enteras_de(matriz)[0]
+    if detallar:
+        salida("Paso 1: Multiplicar cada fila por el común denominador de sus elementos para trabajar con enteros.")
+        salida(_texto_aumentada(filas, columnas_pivote))
+    columnas, divisor = _escalonar_enteros(filas, columnas_pivote, detallar, salida, columnas_pivote)
+
+    # Todas las filas pivote valen divisor en su columna pivote; las demás ya son nulas en esas columnas
+    rango = len(columnas)
+    reducida = [[Fraction(x, divisor) for x in fila] for fila in filas]
+    resultado = nueva_matriz(m, n, reducida)
+    if detallar:
+        salida(f"Paso final: Dividir cada fila por {divisor}.")
+        salida(_texto_aumentada(reducida, columnas_pivote))
+    elif explicacion == EXPLICACION_RESUMEN:
+        salida(f"Eliminación sin fracciones: rango {rango}, columnas pivote "
+               f"{', '.join(str(c + 1) for c in columnas) or 'ninguna'}, divisor final {divisor}.")
+    return {'matriz': resultado, 'rango': rango, 'columnas_pivote': columnas}
+
+
+@_instrumentado()
+@_con_archivos(1, mapear=True)
+def analizar_sistema(matriz_aumentada, explicacion=EXPLICACION_NINGUNA, salida=print):
+    # Resuelve [A | b] de cualquier forma: rango, consistencia, una solución particular
+    # (variables libres en 0) y una base del espacio nulo de A
+    if matriz_aumentada['columnas'] < 2:
+        raise ValueError("La matriz aumentada debe tener al menos una columna de coeficientes y una de términos")
+    variables = matriz_aumentada['columnas'] - 1
+    forma = forma_escalonada_reducida(matriz_aumentada, variables, explicacion, salida)
+    reducida = forma['matriz']['datos']
+    rango = forma['rango']
+    columnas = forma['columnas_pivote']
+
+    consistente = all(fila[variables] == 0 for fila in reducida[rango:])
+    solucion = None
+    if consistente:
+        solucion = [Fraction(0)] * variables
+        for r, c in enumerate(columnas):
+            solucion[c] = reducida[r][variables]
+
+    es_pivote = set(columnas)
+    base_nulo = []
+    for libre in range(variables):
+        if libre in es_pivote:
+            continue
+        vector = [Fraction(0)] * variables
+        vector[libre] = Fraction(1)
+        for r, c in enumerate(columnas):
+            vector[c] = -reducida[r][libre]
+        base_nulo.append(vector)
 
-        pivote = datos[i][i]
-        datos[i] = [x / pivote for x in datos[i]]
-        pasos.append(f"Dividir fila {i + 1} por {pivote}")
+    return {
+        'matriz': forma['matriz'],
+        'rango': rango,
+        'columnas_pivote': columnas,
+        'consistente': consistente,
+        'solucion_particular': solucion,
+        'base_nulo': base_nulo
+    }
 
-        for j in range(n):
-            if i != j:
-                factor = datos[j][i]
-                datos[j] = [datos[j][k] - factor * datos[i][k] for k in range(m)]
-                pasos.append(f"Restar {factor} veces la fila {i + 1} de la fila {j + 1}")
 
-    pasos.append("Resultado final:")
-    pasos.append('\n'.join([' '.join(map(str, fila)) for fila in datos]))
-    print("\n".join(pasos))
-    return nueva_matriz(n, m, datos)
+@_instrumentado()
+@_con_archivos(1)
+def eliminar_gauss_jordan(matriz, explicacion=EXPLICACION_NINGUNA, salida=print):
+    _validar_explicacion(explicacion)
+    if _es_dispersa(matriz) and matriz['columnas'] == matriz['filas'] + 1:
+        soluciones, _ = _resolver_disperso(matriz)
+        # Si A es singular se sigue con la eliminación densa, que admite rango incompleto
+        if soluciones is not None:
+            n = matriz['filas']
+            resultado = nueva_matriz_dispersa(n, n + 1, {})
+            for i, x in enumerate(soluciones):
+                resultado['entradas'][i][i] = Fraction(1)
+                if x != 0:
+                    resultado['entradas'][i][n] = x
+            if explicacion != EXPLICACION_NINGUNA:
+                salida("Resultado final (eliminación dispersa con orden de Markowitz):")
+                salida(matriz_string(resultado))
+            return resultado
+
+    # La última columna se trata como términos independientes y nunca se usa como pivote
+    forma = forma_escalonada_reducida(matriz, max(matriz['columnas'] - 1, 1), explicacion, salida)
+    if explicacion != EXPLICACION_NINGUNA:
+        salida("Resultado final:")
+        salida(matriz_string(forma['matriz']))
+    return forma['matriz']
+
+
+@_instrumentado()
+@_con_archivos(2)
+def resolver_sistemas(matriz_coeficientes, matriz_b, factorizacion=None, backend=None):
+    n = matriz_coeficientes['filas']
+    if matriz_b['filas'] != n:
+        raise ValueError("Los vectores b deben tener tantas filas como la matriz de coeficientes")
+
+    matriz_coeficientes = a_densa(matriz_coeficientes)
+    matriz_b = a_densa(matriz_b)
+    backend = _obtener_backend(backend)
+    if backend is not None:
+        return backend.resolver(matriz_coeficientes, matriz_b)
+
+    if factorizacion is None:
+        factorizacion = factorizar_lu(matriz_coeficientes)
+    det_A = factorizacion['determinante']
+    if det_A == 0:
+        raise ValueError("El determinante de A es 0, el sistema no tiene solución única")
 
+    lu = factorizacion['lu']
+    k = matriz_b['columnas']
 
-def resolver_cramer(matriz_aumentada):
+    # Sustitución hacia adelante (L y = P b) para todas las columnas de b a la vez
+    datos_b = matriz_b['datos']
+    x = [datos_b[p][:] for p in factorizacion['permutacion']]
+    for i in range(n):
+        fila_x = x[i]
+        for j in range(i):
+            factor = lu[i][j]
+            if factor != 0:
+                fila_j = x[j]
+                for c in range(k):
+                    fila_x[c] -= factor * fila_j[c]
+
+    # Sustitución hacia atrás (U x = y)
+    for i in range(n - 1, -1, -1):
+        fila_x = x[i]
+        for j in range(i + 1, n):
+            factor = lu[i][j]
+            if factor != 0:
+                fila_j = x[j]
+                for c in range(k):
+                    fila_x[c] -= factor * fila_j[c]
+        pivote = lu[i][i]
+        for c in range(k):
+            fila_x[c] /= pivote
+
+    if _instrumentacion is not None:
+        operaciones = k * n * n
+        _instrumentacion.contar(2 * operaciones, 2 * operaciones)
+        _instrumentacion.registrar_paso("resolver_sistemas", n, chain.from_iterable(x))
+
+    # Por la regla de Cramer det(A_i) = det(A) * x_i
+    numeradores = [[det_A * valor for valor in fila] for fila in x]
+    return nueva_matriz(n, k, x), numeradores, det_A
+
+
+def _pasos_cramer(soluciones, numeradores, det_A):
+    for i, x_i in enumerate(soluciones):
+        yield f"x_{i + 1} = det(A_{i + 1}) / det(A) = {numeradores[i]} / {det_A} = {x_i}"
+
+
+def _explicacion_cramer(soluciones, numeradores, det_A, n, explicacion):
+    if explicacion == EXPLICACION_COMPLETA:
+        return _pasos_cramer(soluciones, numeradores, det_A)
+    if explicacion == EXPLICACION_RESUMEN:
+        return [f"det(A) = {det_A}; {n} incógnitas calculadas como det(A_i) / det(A)"]
+    return []
+
+
+@_instrumentado()
+@_con_archivos(1)
+def resolver_cramer(matriz_aumentada, metodo="lu", factorizacion=None, backend=None,
+                    explicacion=EXPLICACION_NINGUNA, procesos=None):
     if matriz_aumentada['filas'] != matriz_aumentada['columnas'] - 1:
         raise ValueError("La matriz aumentada debe tener una columna más que filas")
+    _validar_explicacion(explicacion)
 
     n = matriz_aumentada['filas']
+    if _es_dispersa(matriz_aumentada):
+        if metodo == "lu" and _obtener_backend(backend) is None:
+            soluciones, det_A = _resolver_disperso(matriz_aumentada)
+            if soluciones is None:
+                raise ValueError("El determinante de A es 0, el sistema no tiene solución única")
+            numeradores = [det_A * x for x in soluciones]
+            return soluciones, _explicacion_cramer(soluciones, numeradores, det_A, n, explicacion)
+        matriz_aumentada = a_densa(matriz_aumentada)
     datos = matriz_aumentada['datos']
 
     A_datos = [fila[:-1] for fila in datos]
@@ -246,35 +2759,961 @@ def resolver_cramer(matriz_aumentada):
     A = nueva_matriz(n, n, A_datos)
     b = nueva_matriz(n, 1, b_datos)
 
-    det_A = calcular_determinante(A)
-    if det_A == 0:
-        raise ValueError("El determinante de A es 0, el sistema no tiene solución única")
+    backend = _obtener_backend(backend)
+    if metodo == "lu" or backend is not None:
+        x, numeradores, det_A = resolver_sistemas(A, b, factorizacion, backend or 'fraccion')
+        soluciones = [fila[0] for fila in x['datos']]
+        numeradores = [fila[0] for fila in numeradores]
+
+    elif metodo == "modular":
+        # Sin explicación solo hacen falta las soluciones y la reconstrucción racional puede terminar antes
+        soluciones, numeradores, det_A = _resolver_multimodular(
+            A_datos, [fila[0] for fila in b_datos], procesos, explicacion != EXPLICACION_NINGUNA)
+
+    elif metodo == "explicar":
+        factorizada = MatrizFactorizada(A, factorizacion=factorizacion)
+        det_A = factorizada.determinante()
+        if det_A == 0:
+            raise ValueError("El determinante de A es 0, el sistema no tiene solución única")
+
+        # Reemplazar la columna i de A por b es una actualización de rango uno, así que cada det(A_i)
+        # sale del lema del determinante en O(n²) en lugar de una eliminación completa
+        columna_b = [fila[0] for fila in b_datos]
+        numeradores = [factorizada.determinante_con_columna(i, columna_b) for i in range(n)]
+        soluciones = [Fraction(det_A_i, det_A) for det_A_i in numeradores]
 
-    soluciones = []
-    explicacion = []
+    else:
+        raise ValueError("Método no reconocido. Use 'lu', 'modular' o 'explicar'")
 
-    for i in range(n):
-        A_i = duplicar_matriz(A)
+    return soluciones, _explicacion_cramer(soluciones, numeradores, det_A, n, explicacion)
+
+
+######################################################
+############## Factorización Incremental #############
+######################################################
+
+class MatrizFactorizada:
+    # Matriz cuadrada con su factorización LU exacta para preguntas de tipo "¿y si cambio este coeficiente?".
+    # Cada cambio de un elemento, una fila o una columna es una actualización de rango uno A + u·vᵀ:
+    #   det(A + u·vᵀ) = det(A)·(1 + vᵀA⁻¹u)                              (lema del determinante)
+    #   (A + u·vᵀ)⁻¹y = A⁻¹y - w·(vᵀA⁻¹y) / (1 + vᵀw),  con w = A⁻¹u    (Sherman-Morrison)
+    # Las correcciones se guardan y se aplican tras la sustitución con la LU original, así cada consulta
+    # cuesta O(n² + k·n) con k cambios acumulados; cada refactorizar_cada cambios se vuelve a factorizar
+    def __init__(self, matriz, refactorizar_cada=None, factorizacion=None):
+        if matriz['filas'] != matriz['columnas']:
+            raise ValueError("Solo se pueden factorizar matrices cuadradas")
+        self.n = matriz['filas']
+        self._datos = [[x if type(x) is Fraction else Fraction(x) for x in fila] for fila in _iterar_filas(matriz)]
+        self.refactorizar_cada = refactorizar_cada or max(self.n, 8)
+        self.actualizaciones = 0
+        self.refactorizaciones = 0
+        self._inversa = None
+        self._refactorizar(factorizacion)
+
+    def _como_dict(self):
+        return {'filas': self.n, 'columnas': self.n, 'datos': self._datos}
+
+    def _refactorizar(self, factorizacion=None):
+        self._factorizacion = factorizacion or factorizar_lu(nueva_matriz(self.n, self.n, self._datos))
+        self._determinante = self._factorizacion['determinante']
+        self._correcciones = []
+        self._desactualizada = False
+        self.refactorizaciones += 1
+        if self._inversa is not None:
+            # Si ya se pidió la inversa se sigue manteniendo, ahora recalculada desde la nueva LU
+            self._inversa = self._calcular_inversa() if self._determinante != 0 else None
+
+    def _calcular_inversa(self):
+        self._inversa = None
+        identidad = [[Fraction(int(i == j)) for j in range(self.n)] for i in range(self.n)]
+        # Las columnas de A⁻¹ salen como filas de la lista
+        return [list(fila) for fila in zip(*self._resolver_columnas(identidad))]
+
+    def refactorizar(self):
+        self._refactorizar()
+
+    def _asegurar(self):
+        if self._desactualizada:
+            self._refactorizar()
+
+    def _resolver_columnas(self, columnas):
+        # A⁻¹·Y para Y con las columnas dadas como filas de la lista: LU original y luego cada corrección
+        k = len(columnas)
+        b = nueva_matriz(self.n, k, [list(fila) for fila in zip(*columnas)])
+        x = resolver_sistemas(self._como_dict(), b, self._factorizacion, 'fraccion')[0]['datos']
+        soluciones = [list(columna) for columna in zip(*x)]
+        for w, v, gamma in self._correcciones:
+            for columna in soluciones:
+                producto = sum(valor * columna[j] for j, valor in v.items())
+                if producto != 0:
+                    factor = producto / gamma
+                    columna[:] = [xi - wi * factor for xi, wi in zip(columna, w)]
+        return soluciones
+
+    def _aplicar_inversa(self, y):
+        if self._inversa is not None:
+            return [sum(map(mul, fila, y)) for fila in self._inversa]
+        return self._resolver_columnas([y])[0]
+
+    def _actualizar(self, u, v):
+        # A + u·vᵀ con u denso y v como diccionario {columna: valor}; self._datos ya tiene la matriz nueva
+        self.actualizaciones += 1
+        if self._desactualizada or self._determinante == 0:
+            # Desde una matriz singular no hay inversa que corregir: se factoriza de nuevo al consultar
+            self._desactualizada = True
+            return
+        w = self._aplicar_inversa(u)
+        gamma = 1 + sum(valor * w[j] for j, valor in v.items())
+        if gamma == 0:
+            self._determinante = Fraction(0)
+            self._inversa = None
+            self._desactualizada = True
+            return
+        self._determinante *= gamma
+        if self._inversa is not None:
+            fila_v = [sum(valor * self._inversa[j][c] for j, valor in v.items()) for c in range(self.n)]
+            for fila, wi in zip(self._inversa, w):
+                if wi != 0:
+                    factor = wi / gamma
+                    fila[:] = [x - factor * y for x, y in zip(fila, fila_v)]
+        self._correcciones.append((w, v, gamma))
+        if len(self._correcciones) >= self.refactorizar_cada:
+            self._desactualizada = True
+
+    def _validar_indice(self, indice, nombre):
+        if isinstance(indice, bool) or not isinstance(indice, int) or not 0 <= indice < self.n:
+            raise ValueError(f"Índice de {nombre} fuera de la matriz: {indice}")
+
+    def cambiar_elemento(self, i, j, valor):
+        self._validar_indice(i, "fila")
+        self._validar_indice(j, "columna")
+        valor = valor if type(valor) is Fraction else Fraction(valor)
+        delta = valor - self._datos[i][j]
+        if delta == 0:
+            return
+        self._datos[i][j] = valor
+        u = [Fraction(0)] * self.n
+        u[i] = delta
+        self._actualizar(u, {j: Fraction(1)})
+
+    def cambiar_fila(self, i, fila):
+        self._validar_indice(i, "fila")
+        if len(fila) != self.n:
+            raise ValueError(f"La fila debe tener {self.n} elementos")
+        fila = [x if type(x) is Fraction else Fraction(x) for x in fila]
+        v = {j: nuevo - anterior for j, (nuevo, anterior) in enumerate(zip(fila, self._datos[i])) if nuevo != anterior}
+        if not v:
+            return
+        self._datos[i] = fila
+        u = [Fraction(0)] * self.n
+        u[i] = Fraction(1)
+        self._actualizar(u, v)
+
+    def cambiar_columna(self, j, columna):
+        self._validar_indice(j, "columna")
+        if len(columna) != self.n:
+            raise ValueError(f"La columna debe tener {self.n} elementos")
+        columna = [x if type(x) is Fraction else Fraction(x) for x in columna]
+        u = [nuevo - fila[j] for nuevo, fila in zip(columna, self._datos)]
+        if not any(u):
+            return
+        for fila, nuevo in zip(self._datos, columna):
+            fila[j] = nuevo
+        self._actualizar(u, {j: Fraction(1)})
+
+    def determinante(self):
+        self._asegurar()
+        return self._determinante
+
+    def determinante_con_columna(self, j, columna):
+        # det(A) si la columna j fuera `columna`, sin modificar la matriz (la sustitución de la regla de Cramer)
+        self._validar_indice(j, "columna")
+        if len(columna) != self.n:
+            raise ValueError(f"La columna debe tener {self.n} elementos")
+        self._asegurar()
+        if self._determinante == 0:
+            datos = [fila[:] for fila in self._datos]
+            for fila, nuevo in zip(datos, columna):
+                fila[j] = nuevo
+            return calcular_determinante(nueva_matriz(self.n, self.n, datos), backend='fraccion')
+        u = [Fraction(nuevo) - fila[j] for nuevo, fila in zip(columna, self._datos)]
+        return self._determinante * (1 + self._aplicar_inversa(u)[j])
+
+    def _exigir_invertible(self):
+        self._asegurar()
+        if self._determinante == 0:
+            raise ValueError("La matriz no tiene inversa porque su determinante es 0")
+
+    def inversa(self):
+        self._exigir_invertible()
+        if self._inversa is None:
+            self._inversa = self._calcular_inversa()
+        return nueva_matriz(self.n, self.n, self._inversa)
+
+    def resolver(self, b):
+        # b como lista de n valores o como matriz n×k; devuelve el mismo tipo
+        self._exigir_invertible()
+        if isinstance(b, list) and not (b and isinstance(b[0], list)):
+            if len(b) != self.n:
+                raise ValueError(f"El vector b debe tener {self.n} elementos")
+            return self._aplicar_inversa([x if type(x) is Fraction else Fraction(x) for x in b])
+        datos = b if isinstance(b, list) else a_densa(b)['datos']
+        if len(datos) != self.n:
+            raise ValueError("Los vectores b deben tener tantas filas como la matriz de coeficientes")
+        columnas = [[Fraction(x) for x in columna] for columna in zip(*datos)]
+        if self._inversa is not None:
+            soluciones = [self._aplicar_inversa(columna) for columna in columnas]
+        else:
+            soluciones = self._resolver_columnas(columnas)
+        return nueva_matriz(self.n, len(columnas), [list(fila) for fila in zip(*soluciones)])
+
+    def numeradores_cramer(self, b):
+        # det(A_i) = det(A)·x_i para cada incógnita
+        soluciones = self.resolver(list(b))
+        return [self._determinante * x for x in soluciones], self._determinante
+
+    def como_matriz(self):
+        return nueva_matriz(self.n, self.n, self._datos)
+
+    def __getitem__(self, clave):
+        # Compatibilidad con las funciones que reciben el diccionario de nueva_matriz
+        if clave in ('filas', 'columnas'):
+            return self.n
+        if clave == 'datos':
+            return [fila[:] for fila in self._datos]
+        i, j = clave
+        if not (0 <= i < self.n and 0 <= j < self.n):
+            raise IndexError("Índice fuera de la matriz")
+        return self._datos[i][j]
+
+    def __repr__(self):
+        return f"MatrizFactorizada({self.n}x{self.n}, {len(self._correcciones)} correcciones pendientes)"
+
+
+######################################################
+################### Modo por Lotes ###################
+######################################################
+
+# Nombres aceptados para cada operación de un trabajo
+ALIAS_OPERACIONES = {
+    'sum': 'suma',
+    'sub': 'resta',
+    'mul': 'multiplicacion',
+    'scalar': 'escalar',
+    'det': 'determinante',
+    'inverse': 'inversa',
+    'gauss-jordan': 'gauss-jordan',
+    'cramer': 'cramer',
+}
+
+
+def _matriz_desde_json(filas):
+    if not filas or not all(isinstance(fila, list) for fila in filas):
+        raise ValueError("Cada matriz debe ser una lista de filas")
+    columnas = len(filas[0])
+    if columnas == 0 or any(len(fila) != columnas for fila in filas):
+        raise ValueError("Todas las filas de una matriz deben tener la misma cantidad de elementos")
+    return nueva_matriz(len(filas), columnas, filas)
+
+
+def _valor_a_json(valor):
+    if isinstance(valor, (dict, Matriz, VistaMatriz)):
+        return [[_valor_a_json(x) for x in fila] for fila in valor['datos']]
+    if isinstance(valor, (list, tuple)):
+        return [_valor_a_json(x) for x in valor]
+    if isinstance(valor, Fraction):
+        return str(valor) if valor.denominator != 1 else valor.numerator
+    return valor
+
+
+def _operando_desde_json(valor):
+    if _es_escalar(valor):
+        return valor
+    if isinstance(valor, str):
+        # Un texto es un escalar si se lee como número ("1/3", "2.5") y si no, la ruta de un archivo
+        try:
+            return parsear_numero(valor)
+        except ValueError:
+            return cargar_matriz(valor)
+    return _matriz_desde_json(valor)
+
+
+def ejecutar_trabajo(trabajo):
+    # Con "instrumentar": true la respuesta incluye los contadores de la ejecución
+    if isinstance(trabajo, dict) and trabajo.get('instrumentar'):
+        with instrumentar() as datos:
+            respuesta = _ejecutar_trabajo(trabajo)
+        respuesta['instrumentacion'] = datos.a_dict()
+        return respuesta
+    return _ejecutar_trabajo(trabajo)
+
+
+def _ejecutar_trabajo(trabajo):
+    inicio = perf_counter()
+    respuesta = {'id': trabajo.get('id') if isinstance(trabajo, dict) else None}
+    try:
+        if not isinstance(trabajo, dict):
+            raise ValueError("Cada trabajo debe ser un objeto JSON")
+        operacion = trabajo.get('operacion')
+        operacion = ALIAS_OPERACIONES.get(operacion, operacion)
+        backend = trabajo.get('backend')
+        with _fase("lectura"):
+            # Cada matriz puede venir como lista de filas o como la ruta de un archivo
+            matrices = [_operando_desde_json(valor) for valor in trabajo.get('matrices', [])]
+        if not matrices:
+            raise ValueError("El trabajo no incluye matrices")
+
+        match operacion:
+            case 'suma':
+                resultado = acumular_matrices(matrices, "suma", backend)
+            case 'resta':
+                resultado = acumular_matrices(matrices, "resta", backend)
+            case 'multiplicacion':
+                resultado = multiplicar_cadena(matrices, backend)[0]
+            case 'escalar':
+                resultado = multiplicar_matrices_escalar(matrices[0], Fraction(str(trabajo['escalar'])), backend)
+            case 'determinante':
+                resultado = calcular_determinante(matrices[0], trabajo.get('metodo', 'auto'), backend)
+            case 'inversa':
+                resultado = calcular_inversa(matrices[0], trabajo.get('metodo', 'g'), backend=backend)
+            case 'gauss-jordan':
+                resultado = eliminar_gauss_jordan(matrices[0])
+            case 'cramer':
+                resultado = resolver_cramer(matrices[0], backend=backend)[0]
+            case _:
+                raise ValueError(f"Operación no reconocida: {operacion}")
+
+        respuesta['ok'] = True
+        with _fase("formato"):
+            respuesta['resultado'] = _valor_a_json(resultado)
+    except Exception as e:
+        respuesta['ok'] = False
+        respuesta['error'] = str(e) or type(e).__name__
+    respuesta['tiempo'] = perf_counter() - inicio
+    return respuesta
+
+
+def _leer_trabajo(linea):
+    try:
+        return json.loads(linea, parse_float=Fraction)
+    except json.JSONDecodeError as e:
+        return {'_error': f"JSON no válido: {e}"}
+
+
+def _ejecutar_tramo(tramo):
+    resultados = []
+    for indice, trabajo in tramo:
+        if isinstance(trabajo, dict) and '_error' in trabajo:
+            respuesta = {'id': None, 'ok': False, 'error': trabajo['_error'], 'tiempo': 0.0}
+        else:
+            respuesta = ejecutar_trabajo(trabajo)
+        respuesta['indice'] = indice
+        resultados.append(respuesta)
+    return resultados
+
+
+def _tramos(lineas, tamano_tramo):
+    tramo = []
+    indice = 0
+    for linea in lineas:
+        if not linea.strip():
+            continue
+        tramo.append((indice, _leer_trabajo(linea)))
+        indice += 1
+        if len(tramo) == tamano_tramo:
+            yield tramo
+            tramo = []
+    if tramo:
+        yield tramo
+
+
+def ejecutar_lote(entrada, salida, procesos=None, tamano_tramo=64):
+    # Los resultados se escriben en el mismo orden que los trabajos, a medida que terminan
+    procesos = procesos or os.cpu_count() or 1
+    total = 0
+
+    def escribir(resultados):
+        nonlocal total
+        for respuesta in resultados:
+            salida.write(json.dumps(respuesta, ensure_ascii=False) + "\n")
+            total += 1
+        salida.flush()
+
+    if procesos == 1:
+        for tramo in _tramos(entrada, tamano_tramo):
+            escribir(_ejecutar_tramo(tramo))
+        return total
+
+    # Se mantiene una ventana acotada de tramos en vuelo para no leer toda la entrada en memoria
+    with ProcessPoolExecutor(procesos) as ejecutor:
+        pendientes = deque()
+        for tramo in _tramos(entrada, tamano_tramo):
+            pendientes.append(ejecutor.submit(_ejecutar_tramo, tramo))
+            if len(pendientes) >= procesos * 2:
+                escribir(pendientes.popleft().result())
+        while pendientes:
+            escribir(pendientes.popleft().result())
+    return total
 
-        for j in range(n):
-            A_i['datos'][j][i] = b['datos'][j][0]
 
-        det_A_i = calcular_determinante(A_i)
+######################################################
+################# Servidor JSON-RPC ##################
+######################################################
 
-        x_i = Fraction(det_A_i, det_A)
-        soluciones.append(x_i)
+# Nombres de método aceptados: los de las funciones de la calculadora y los de las operaciones del lote
+METODOS_RPC = {
+    'sumar_matrices': 'suma',
+    'restar_matrices': 'resta',
+    'multiplicar_matrices': 'multiplicacion',
+    'multiplicar_matrices_escalar': 'escalar',
+    'calcular_determinante': 'determinante',
+    'calcular_inversa': 'inversa',
+    'eliminar_gauss_jordan': 'gauss-jordan',
+    'resolver_cramer': 'cramer',
+    **{operacion: operacion for operacion in ('suma', 'resta', 'multiplicacion', 'escalar', 'determinante',
+                                             'inversa', 'gauss-jordan', 'cramer')},
+    **ALIAS_OPERACIONES
+}
+
+ERROR_JSON = -32700
+ERROR_SOLICITUD = -32600
+ERROR_METODO = -32601
+ERROR_CALCULO = -32000
+ERROR_TIEMPO = -32001
+
+DIRECCION_SERVIDOR = "127.0.0.1:8765"
+TIEMPO_MAXIMO_SOLICITUD = 30.0
+# Trabajos con hasta esta cantidad de elementos se calculan en el propio bucle de eventos: enviarlos
+# a otro proceso cuesta más que calcularlos. Allí no hay tiempo máximo, así que también se acota el
+# tamaño de cada número
+ELEMENTOS_EN_LINEA = 100
+BITS_EN_LINEA = 64
+
+
+def _direccion(direccion):
+    # "unix:/ruta" o una ruta con '/' es un socket Unix; "host:puerto" es TCP y solo se admite localhost
+    if direccion.startswith("unix:"):
+        return "unix", direccion[5:]
+    if "/" in direccion:
+        return "unix", direccion
+    host, _, puerto = direccion.rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+    if host not in ("127.0.0.1", "localhost", "::1"):
+        raise ValueError("El servidor solo escucha en localhost")
+    try:
+        return "tcp", (host, int(puerto))
+    except ValueError:
+        raise ValueError(f"Dirección no válida: {direccion}")
 
-        explicacion.append(f"x_{i + 1} = det(A_{i + 1}) / det(A) = {det_A_i} / {det_A} = {x_i}")
 
-    return soluciones, explicacion
+def _respuesta_rpc(identificador, resultado=None, codigo=None, mensaje=None):
+    respuesta = {'jsonrpc': "2.0", 'id': identificador}
+    if codigo is None:
+        respuesta['result'] = resultado
+    else:
+        respuesta['error'] = {'code': codigo, 'message': mensaje}
+    return respuesta
+
+
+def _numero_liviano(valor):
+    if isinstance(valor, str):
+        # Un exponente ("1e999999") puede describir un entero enorme con pocos caracteres
+        return len(valor) <= BITS_EN_LINEA // 3 and 'e' not in valor.lower()
+    if isinstance(valor, (int, Fraction)):
+        valor = Fraction(valor)
+        return max(valor.numerator.bit_length(), valor.denominator.bit_length()) <= BITS_EN_LINEA
+    return False
+
+
+def _es_liviano(trabajo):
+    if trabajo.get('metodo') == "explicar":
+        return False
+    if 'escalar' in trabajo and not _numero_liviano(trabajo['escalar']):
+        return False
+    elementos = 0
+    for matriz in trabajo.get('matrices', []):
+        if isinstance(matriz, str):
+            # Un texto como operando puede ser la ruta de un archivo de cualquier tamaño
+            return False
+        filas = matriz if isinstance(matriz, list) else [[matriz]]
+        for fila in filas:
+            fila = fila if isinstance(fila, list) else [fila]
+            elementos += len(fila)
+            if elementos > ELEMENTOS_EN_LINEA or not all(_numero_liviano(x) for x in fila):
+                return False
+    return True
+
+
+def _resolver_rutas(trabajo, directorio_datos):
+    # Los operandos de texto que no son números son rutas de archivos. Por RPC solo se admiten si el
+    # servidor tiene un directorio de datos, y siempre dentro de él (sin escapar con '..' o enlaces)
+    matrices = trabajo.get('matrices')
+    if not isinstance(matrices, list):
+        return
+    for i, valor in enumerate(matrices):
+        if not isinstance(valor, str):
+            continue
+        try:
+            parsear_numero(valor)
+            continue
+        except ValueError:
+            pass
+        if directorio_datos is None:
+            raise ValueError("Este servidor no admite archivos como operandos")
+        base = os.path.realpath(directorio_datos)
+        ruta = os.path.realpath(os.path.join(base, valor))
+        if os.path.commonpath([base, ruta]) != base:
+            raise ValueError(f"El archivo {valor} está fuera del directorio de datos del servidor")
+        matrices[i] = ruta
+
+
+def _tiempo_maximo_solicitud(parametros, tiempo_maximo):
+    if 'tiempo_maximo' not in parametros:
+        return tiempo_maximo
+    limite = parametros['tiempo_maximo']
+    if isinstance(limite, bool) or not isinstance(limite, (int, Fraction)) or limite <= 0:
+        raise ValueError("tiempo_maximo debe ser un número positivo de segundos")
+    return float(min(limite, tiempo_maximo))
+
+
+def _bucle_trabajador_servidor(conexion):
+    # Proceso trabajador del servidor: atiende un trabajo por vez hasta que se cierra la conexión. Ctrl+C
+    # lo recibe el servidor, que es quien termina a sus trabajadores
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            trabajo = conexion.recv()
+        except (EOFError, OSError):
+            return
+        conexion.send(ejecutar_trabajo(trabajo))
+
+
+class _TrabajadorServidor:
+    def __init__(self):
+        self.conexion, extremo = multiprocessing.Pipe()
+        self.proceso = multiprocessing.Process(target=_bucle_trabajador_servidor, args=(extremo,))
+        self.proceso.start()
+        extremo.close()
+
+    def terminar(self):
+        self.conexion.close()
+        self.proceso.terminate()
+        self.proceso.join(1)
+        if self.proceso.is_alive():
+            self.proceso.kill()
+            self.proceso.join()
+
+
+class _PoolServidor:
+    # Procesos trabajadores del servidor, como máximo `procesos` a la vez y cada uno con un solo trabajo.
+    # Un trabajo que agota su tiempo (o cuyo proceso muere) solo termina su propio proceso, que se
+    # reemplaza por uno nuevo cuando hace falta: los trabajos de otros clientes siguen sin enterarse
+    def __init__(self, procesos):
+        self.procesos = procesos
+        self._cupos = asyncio.Semaphore(procesos)
+        self._libres = []
+        self._trabajadores = set()
+        # Los trabajadores no son procesos demonio (pueden abrir sus propios procesos para un producto
+        # paralelo), así que se terminan al salir aunque el servidor no haya llegado a cerrarse
+        atexit.register(self.cerrar)
+
+    async def ejecutar(self, trabajo, tiempo_maximo):
+        bucle = asyncio.get_running_loop()
+        fin = bucle.time() + tiempo_maximo
+        # La espera por un proceso libre también cuenta para el tiempo máximo
+        await asyncio.wait_for(self._cupos.acquire(), tiempo_maximo)
+        try:
+            if self._libres:
+                trabajador = self._libres.pop()
+            else:
+                trabajador = _TrabajadorServidor()
+                self._trabajadores.add(trabajador)
+            try:
+                respuesta = await self._esperar(trabajador, trabajo, fin - bucle.time())
+            except BaseException:
+                # Tiempo agotado, proceso caído o solicitud cancelada: el estado del proceso es desconocido
+                self._trabajadores.discard(trabajador)
+                trabajador.terminar()
+                raise
+            self._libres.append(trabajador)
+            return respuesta
+        finally:
+            self._cupos.release()
+
+    async def _esperar(self, trabajador, trabajo, tiempo_restante):
+        bucle = asyncio.get_running_loop()
+        listo = bucle.create_future()
+        descriptor = trabajador.conexion.fileno()
+        bucle.add_reader(descriptor, lambda: listo.done() or listo.set_result(None))
+        try:
+            trabajador.conexion.send(trabajo)
+            await asyncio.wait_for(listo, max(tiempo_restante, 0))
+            return trabajador.conexion.recv()
+        except asyncio.TimeoutError:
+            raise
+        except (EOFError, OSError):
+            raise ValueError("Un proceso trabajador terminó inesperadamente")
+        finally:
+            bucle.remove_reader(descriptor)
+
+    def cerrar(self):
+        atexit.unregister(self.cerrar)
+        for trabajador in self._trabajadores:
+            trabajador.terminar()
+        self._trabajadores.clear()
+        self._libres.clear()
+
+
+async def _atender_solicitud(linea, pool, tiempo_maximo, directorio_datos=None):
+    try:
+        solicitud = json.loads(linea, parse_float=Fraction)
+    except json.JSONDecodeError as e:
+        return _respuesta_rpc(None, codigo=ERROR_JSON, mensaje=f"JSON no válido: {e}")
+    if not isinstance(solicitud, dict) or not isinstance(solicitud.get('method'), str):
+        return _respuesta_rpc(None, codigo=ERROR_SOLICITUD, mensaje="Solicitud JSON-RPC no válida")
+
+    identificador = solicitud.get('id')
+    operacion = METODOS_RPC.get(solicitud['method'])
+    if operacion is None:
+        return _respuesta_rpc(identificador, codigo=ERROR_METODO, mensaje=f"Método no encontrado: {solicitud['method']}")
+    parametros = solicitud.get('params') or {}
+    if not isinstance(parametros, dict):
+        return _respuesta_rpc(identificador, codigo=ERROR_SOLICITUD, mensaje="Los parámetros deben ser un objeto")
+
+    trabajo = dict(parametros, operacion=operacion, id=identificador)
+    if isinstance(trabajo.get('matrices'), list):
+        trabajo['matrices'] = list(trabajo['matrices'])
+    try:
+        limite = _tiempo_maximo_solicitud(parametros, tiempo_maximo)
+        _resolver_rutas(trabajo, directorio_datos)
+    except ValueError as e:
+        return _respuesta_rpc(identificador, codigo=ERROR_SOLICITUD, mensaje=str(e))
+    try:
+        if _es_liviano(trabajo):
+            respuesta = ejecutar_trabajo(trabajo)
+        else:
+            respuesta = await pool.ejecutar(trabajo, limite)
+    except asyncio.TimeoutError:
+        return _respuesta_rpc(identificador, codigo=ERROR_TIEMPO, mensaje=f"Se superó el tiempo máximo de {limite} s")
+    except ValueError as e:
+        return _respuesta_rpc(identificador, codigo=ERROR_CALCULO, mensaje=str(e))
+    if not respuesta['ok']:
+        return _respuesta_rpc(identificador, codigo=ERROR_CALCULO, mensaje=respuesta['error'])
+    return _respuesta_rpc(identificador, respuesta['resultado'])
+
+
+async def _atender_conexion(lector, escritor, pool, semaforo, tiempo_maximo, directorio_datos=None):
+    async def responder(linea, liberar):
+        try:
+            respuesta = await _atender_solicitud(linea, pool, tiempo_maximo, directorio_datos)
+            # Las notificaciones (sin id) no tienen respuesta
+            if respuesta['id'] is not None or 'error' in respuesta:
+                escritor.write((json.dumps(respuesta, ensure_ascii=False) + "\n").encode())
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            if liberar:
+                semaforo.release()
+
+    tareas = set()
+    try:
+        while linea := await lector.readline():
+            if not linea.strip():
+                continue
+            # Mientras todos los cupos están ocupados no se leen más solicitudes: el cliente queda
+            # frenado por el propio socket
+            await semaforo.acquire()
+            tarea = asyncio.create_task(responder(linea, True))
+            tareas.add(tarea)
+            tarea.add_done_callback(tareas.discard)
+        if tareas:
+            await asyncio.gather(*tareas)
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+
+async def _servir(direccion, procesos, tiempo_maximo, maximo_pendientes, listo=None, directorio_datos=None):
+    tipo, destino = _direccion(direccion)
+    procesos = procesos or os.cpu_count() or 1
+    pool = _PoolServidor(procesos)
+    semaforo = asyncio.Semaphore(maximo_pendientes or 4 * procesos)
+
+    def conexion(lector, escritor):
+        return _atender_conexion(lector, escritor, pool, semaforo, tiempo_maximo, directorio_datos)
+
+    if tipo == "unix":
+        if os.path.exists(destino):
+            os.unlink(destino)
+        servidor = await asyncio.start_unix_server(conexion, path=destino)
+    else:
+        servidor = await asyncio.start_server(conexion, host=destino[0], port=destino[1])
+    try:
+        async with servidor:
+            if listo is not None:
+                listo(servidor)
+            await servidor.serve_forever()
+    finally:
+        pool.cerrar()
+        if tipo == "unix" and os.path.exists(destino):
+            os.unlink(destino)
+
+
+def iniciar_servidor(direccion=DIRECCION_SERVIDOR, procesos=None, tiempo_maximo=TIEMPO_MAXIMO_SOLICITUD,
+                     maximo_pendientes=None, directorio_datos=None):
+    # Sin directorio_datos los clientes solo pueden enviar matrices en la propia solicitud
+    if directorio_datos is not None and not os.path.isdir(directorio_datos):
+        raise ValueError(f"No existe el directorio de datos {directorio_datos}")
+    try:
+        asyncio.run(_servir(direccion, procesos, tiempo_maximo, maximo_pendientes,
+                            directorio_datos=directorio_datos))
+    except KeyboardInterrupt:
+        pass
+
+
+def _valor_desde_json(valor):
+    if isinstance(valor, list):
+        if valor and all(isinstance(fila, list) for fila in valor):
+            return nueva_matriz(len(valor), len(valor[0]), [[Fraction(x) for x in fila] for fila in valor])
+        return [_valor_desde_json(x) for x in valor]
+    if isinstance(valor, (int, str, Fraction)):
+        return Fraction(valor)
+    return valor
+
+
+def _matriz_a_json(matriz):
+    if _es_ruta(matriz):
+        return os.fspath(matriz)
+    if _es_escalar(matriz):
+        return _valor_a_json(matriz)
+    if isinstance(matriz, list):
+        return [[_valor_a_json(x) for x in fila] for fila in matriz]
+    return [[_valor_a_json(x) for x in fila] for fila in _iterar_filas(matriz)]
+
+
+class ClienteCalculadora:
+    # Cliente bloqueante del servidor: cada llamada envía una solicitud y espera su respuesta
+    def __init__(self, direccion=DIRECCION_SERVIDOR, tiempo_espera=None):
+        tipo, destino = _direccion(direccion)
+        if tipo == "unix":
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self._socket = socket.socket(socket.AF_INET6 if ":" in destino[0] else socket.AF_INET,
+                                         socket.SOCK_STREAM)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._socket.settimeout(tiempo_espera)
+        self._socket.connect(destino)
+        self._lector = self._socket.makefile("rb")
+        self._siguiente_id = 0
+
+    def llamar(self, nombre, **parametros):
+        self._siguiente_id += 1
+        if 'matrices' in parametros:
+            parametros['matrices'] = [_matriz_a_json(m) for m in parametros['matrices']]
+        if 'escalar' in parametros:
+            parametros['escalar'] = _valor_a_json(parametros['escalar'])
+        solicitud = {'jsonrpc': "2.0", 'id': self._siguiente_id, 'method': nombre, 'params': parametros}
+        self._socket.sendall((json.dumps(solicitud, ensure_ascii=False) + "\n").encode())
+        linea = self._lector.readline()
+        if not linea:
+            raise ConnectionError("El servidor cerró la conexión")
+        respuesta = json.loads(linea, parse_float=Fraction)
+        if 'error' in respuesta:
+            raise ValueError(respuesta['error']['message'])
+        return _valor_desde_json(respuesta['result'])
+
+    def sumar(self, *matrices, backend=None):
+        return self.llamar('suma', matrices=matrices, backend=backend)
+
+    def restar(self, *matrices, backend=None):
+        return self.llamar('resta', matrices=matrices, backend=backend)
+
+    def multiplicar(self, *operandos, backend=None):
+        return self.llamar('multiplicacion', matrices=operandos, backend=backend)
+
+    def multiplicar_escalar(self, matriz, escalar, backend=None):
+        return self.llamar('escalar', matrices=[matriz], escalar=escalar, backend=backend)
+
+    def determinante(self, matriz, metodo="auto", backend=None):
+        return self.llamar('determinante', matrices=[matriz], metodo=metodo, backend=backend)
+
+    def inversa(self, matriz, metodo="g", backend=None):
+        return self.llamar('inversa', matrices=[matriz], metodo=metodo, backend=backend)
+
+    def gauss_jordan(self, matriz):
+        return self.llamar('gauss-jordan', matrices=[matriz])
+
+    def cramer(self, matriz_aumentada, backend=None):
+        return self.llamar('cramer', matrices=[matriz_aumentada], backend=backend)
+
+    def cerrar(self):
+        self._lector.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
 
 
 ######################################################
 ################## Función Princiapl #################
 ######################################################
 
+# Nivel de explicación que usa el menú interactivo
+nivel_explicacion_sesion = EXPLICACION_COMPLETA
+instrumentacion_sesion = False
+archivo_instrumentacion = None
+
+
+def _iniciar_instrumentacion_menu():
+    global _instrumentacion
+    _instrumentacion = Instrumentacion() if instrumentacion_sesion else None
+
+
+def _informar_instrumentacion_menu():
+    # Muestra los contadores de la operación anterior del menú y los agrega al archivo JSON si hay uno
+    global _instrumentacion
+    datos = _instrumentacion
+    _instrumentacion = None
+    if datos is None or not datos.llamadas:
+        return
+    print("\n" + datos.resumen())
+    if archivo_instrumentacion is not None:
+        with open(archivo_instrumentacion, "a", encoding="utf-8") as archivo:
+            archivo.write(datos.a_json() + "\n")
+
+
+def _explorar_cambios(A, factorizacion, b):
+    # Ciclo "¿y si...?": cada cambio actualiza la factorización en O(n²) en lugar de resolver de nuevo
+    factorizada = MatrizFactorizada(A, factorizacion=factorizacion)
+    n = factorizada.n
+
+    def indice(texto):
+        # Los índices se escriben desde 1; 0 o un negativo no deben apuntar al final de la matriz
+        k = int(texto)
+        if not 1 <= k <= n:
+            raise ValueError(f"Los índices deben estar entre 1 y {n}")
+        return k - 1
+
+    while True:
+        cambio = input("\nCambiar el sistema: 'a i j valor' (coeficiente), 'f i v1 ... vn' (fila de A), "
+                       "'c j v1 ... vn' (columna de A), 'b i valor' (término independiente); "
+                       "Enter para terminar: ").split()
+        if not cambio:
+            return
+        try:
+            tipo, indices = cambio[0].lower(), cambio[1:]
+            if tipo == 'a' and len(indices) == 3:
+                factorizada.cambiar_elemento(indice(indices[0]), indice(indices[1]),
+                                             parsear_numero(indices[2], limite_denominador_sesion))
+            elif tipo in ('f', 'c') and len(indices) == n + 1:
+                valores = parsear_fila(' '.join(indices[1:]), n, limite_denominador_sesion)
+                if tipo == 'f':
+                    factorizada.cambiar_fila(indice(indices[0]), valores)
+                else:
+                    factorizada.cambiar_columna(indice(indices[0]), valores)
+            elif tipo == 'b' and len(indices) == 2:
+                b[indice(indices[0])] = parsear_numero(indices[1], limite_denominador_sesion)
+            else:
+                print("Formato no válido")
+                continue
+        except (ValueError, IndexError) as e:
+            print(f"Formato no válido: {e}" if str(e) else "Formato no válido")
+            continue
+
+        determinante = factorizada.determinante()
+        print(f"Determinante de A: {determinante}")
+        if determinante == 0:
+            print("El sistema no tiene solución única porque el determinante de A es 0")
+            continue
+        for i, sol in enumerate(factorizada.resolver(b)):
+            print(f"x_{i + 1} = {sol}")
+
+
+def _ofrecer_guardar(resultado):
+    ruta = input(f"Ruta para guardar el resultado ({EXTENSION_BINARIA} binario exacto, {EXTENSION_NUMPY} numpy, "
+                 f"otra extensión texto; Enter para omitir): ").strip()
+    if not ruta:
+        return
+    try:
+        guardar_matriz(ruta, resultado)
+        print(f"Resultado guardado en {ruta}")
+    except (ValueError, OverflowError, OSError) as e:
+        print(f"Error al guardar: {e}")
+
+
+def menu_configuracion():
+    global nivel_explicacion_sesion, instrumentacion_sesion, limite_denominador_sesion
+    print("\nConfiguración")
+    print(f"Backend numérico actual: {backend_sesion}")
+    print("Backends disponibles: fraccion (exacto), numpy (float64), modular (enteros módulo p)")
+    nombre = input("Ingrese el backend a usar (Enter para mantener el actual): ").strip().lower()
+    if nombre:
+        try:
+            establecer_backend(nombre)
+            print(f"Backend cambiado a {nombre}")
+        except ValueError as e:
+            print(f"Error: {e}")
+
+    print(f"Nivel de explicación actual: {nivel_explicacion_sesion}")
+    nivel = input(f"Ingrese el nivel de explicación ({', '.join(NIVELES_EXPLICACION)}) "
+                  f"(Enter para mantener el actual): ").strip().lower()
+    if nivel:
+        if nivel in NIVELES_EXPLICACION:
+            nivel_explicacion_sesion = nivel
+            print(f"Nivel de explicación cambiado a {nivel}")
+        else:
+            print("Nivel de explicación no reconocido")
+
+    estadisticas = estadisticas_cache()
+    print(f"Caché de resultados: {estadisticas['entradas']} entradas, "
+          f"{estadisticas['memoria_usada'] / 2**20:.2f} de {estadisticas['memoria_maxima'] / 2**20:.2f} MB, "
+          f"{estadisticas['aciertos']} aciertos, {estadisticas['fallos']} fallos, "
+          f"{estadisticas['expulsiones']} expulsiones")
+    memoria = input("Ingrese la memoria máxima de la caché en MB, 0 para desactivarla o 'v' para vaciarla "
+                    "(Enter para mantener la actual): ").strip().lower()
+    if memoria == "v":
+        cache_resultados.limpiar()
+        print("Caché vaciada")
+    elif memoria:
+        try:
+            megas = float(memoria)
+            if megas == 0:
+                configurar_cache(activa=False)
+                print("Caché desactivada")
+            else:
+                configurar_cache(memoria_maxima=int(megas * 2**20), activa=True)
+                print(f"Memoria de la caché cambiada a {megas} MB")
+        except ValueError as e:
+            print(f"Error: {e}")
+
+    print(f"Límite de denominador al leer números: {limite_denominador_sesion or 'sin límite'}")
+    limite = input("Ingrese el denominador máximo, 0 para leer los números exactos "
+                   "(Enter para mantener el actual): ").strip()
+    if limite:
+        try:
+            limite = int(limite)
+            if limite < 0:
+                raise ValueError
+            limite_denominador_sesion = limite or None
+            print(f"Límite de denominador cambiado a {limite_denominador_sesion or 'sin límite'}")
+        except ValueError:
+            print("El límite debe ser un entero positivo")
+
+    estado = "activada" if instrumentacion_sesion else "desactivada"
+    activar = input(f"Instrumentación {estado}. ¿Activarla? (s/n, Enter para mantener): ").strip().lower()
+    if activar in ("s", "n"):
+        instrumentacion_sesion = activar == "s"
+        print(f"Instrumentación {'activada' if instrumentacion_sesion else 'desactivada'}")
+
+
 def main():
     while True:
+        _informar_instrumentacion_menu()
         print("\nCalculadora de Álgebra Lineal")
         print("Seleccione una operación:")
         print("1. Sumar matrices")
@@ -285,8 +3724,11 @@ def main():
         print("6. Eliminación de Gauss-Jordan")
         print("7. Regla de Cramer")
         print("8. Salir")
+        print("9. Configuración")
 
-        opcion = input("Seleccione una opción (1-8): ")
+        opcion = input("Seleccione una opción (1-9): ")
+        if opcion in ('1', '2', '3', '4', '5', '6', '7'):
+            _iniciar_instrumentacion_menu()
 
         match opcion:
             case '1':  # Suma de matrices
@@ -299,34 +3741,15 @@ def main():
                     print("Número invalido")
                     continue
 
-                operandos = []
-                for i in range(contador):
-                    operandos.append(input_matriz((i + 1)))
-
-                resultado = operandos[0]
-                pasos = []
-
-                # Realizar las sumas secuencialmente
-                for i in range(1, len(operandos)):
-                    try:
-                        nuevo_resultado = sumar_matrices(resultado, operandos[i])
-                        resultado_str = matriz_string(resultado)
-                        operando_str = matriz_string(operandos[i])
-                        nuevo_resultado_str = matriz_string(nuevo_resultado)
-
-                        pasos.append(f"{resultado_str}\n+\n{operando_str}\n=\n{nuevo_resultado_str}\n")
-                        resultado = nuevo_resultado
-                    except ValueError as e:
-                        print(f"Error: {e}")
-                        break
-
-                # Mostrar los pasos y el resultado
-                if pasos:
-                    print("\nSOLUCIÓN PASO A PASO:")
-                    for paso in pasos:
-                        print(paso)
+                # Los operandos se piden a medida que se acumulan, sin guardarlos todos en memoria
+                operandos = (input_matriz(i + 1) for i in range(contador))
+                try:
+                    resultado = acumular_matrices(operandos, "suma", explicacion=nivel_explicacion_sesion)
                     print("\nRESULTADO:")
                     print(matriz_string(resultado))
+                    _ofrecer_guardar(resultado)
+                except ValueError as e:
+                    print(f"Error: {e}")
 
             case '2':  # Resta de matrices
                 try:
@@ -338,35 +3761,15 @@ def main():
                     print("Número invalido")
                     continue
 
-                operandos = []
-                for i in range(contador):
-                    operandos.append(input_matriz((i + 1)))
-
-                # Inicializar los pasos y el resultado
-                resultado = operandos[0]
-                pasos = []
-
-                # Realizar las restas secuencialmente
-                for i in range(1, len(operandos)):
-                    try:
-                        nuevo_resultado = restar_matrices(resultado, operandos[i])
-                        resultado_str = matriz_string(resultado)
-                        operando_str = matriz_string(operandos[i])
-                        nuevo_resultado_str = matriz_string(nuevo_resultado)
-
-                        pasos.append(f"{resultado_str}\n-\n{operando_str}\n=\n{nuevo_resultado_str}\n")
-                        resultado = nuevo_resultado
-                    except ValueError as e:
-                        print(f"Error: {e}")
-                        break
-
-                # Mostrar los pasos y el resultado
-                if pasos:
-                    print("\nSOLUCIÓN PASO A PASO:")
-                    for paso in pasos:
-                        print(paso)
+                # Los operandos se piden a medida que se acumulan, sin guardarlos todos en memoria
+                operandos = (input_matriz(i + 1) for i in range(contador))
+                try:
+                    resultado = acumular_matrices(operandos, "resta", explicacion=nivel_explicacion_sesion)
                     print("\nRESULTADO:")
                     print(matriz_string(resultado))
+                    _ofrecer_guardar(resultado)
+                except ValueError as e:
+                    print(f"Error: {e}")
 
             case '3':  # Multiplicación
                 try:
@@ -388,71 +3791,27 @@ def main():
                     else:
                         print("Opción invalida")
                         break
+                if len(operandos) != contador:
+                    continue
 
-                # Inicializar los pasos y el resultado
-                resultado = operandos[0]
-                pasos = []
-
-                # Realizar las multiplicaciones secuencialmente
-                for i in range(1, len(operandos)):
-                    try:
-                        # Comprobar si la operación es escalar
-                        actual_es_escalar = isinstance(resultado, (int, float))
-                        prox_es_escalar = isinstance(operandos[i], (int, float))
-
-                        if actual_es_escalar or prox_es_escalar:
-                            # Manejar multiplicación escalar
-                            if actual_es_escalar and prox_es_escalar:
-                                # Ambos son escalares
-                                nuevo_resultado = resultado * operandos[i]
-                                explicacion = []
-                                simbolo_op = '×'
-                            elif actual_es_escalar:
-                                # Escalar * Matriz
-                                escalar = resultado
-                                matriz = operandos[i]
-                                nuevo_resultado = multiplicar_matrices_escalar(matriz, escalar)
-                                explicacion = []
-                                simbolo_op = '× scalar'
-                            else:
-                                # Matriz * Escalar
-                                escalar = operandos[i]
-                                nuevo_resultado = multiplicar_matrices_escalar(resultado, escalar)
-                                explicacion = []
-                                simbolo_op = '× scalar'
-                        else:
-                            # Multiplicación de matrices
-                            nuevo_resultado, explicacion = multiplicar_matrices(resultado, operandos[i])
-                            simbolo_op = '×'
-
-                        # Agregar explicación si existe
-                        if explicacion:
-                            pasos.extend(explicacion)
-
-                        # Formato de cadenas para mostrar
-                        resultado_str = resultado if isinstance(resultado, (int, float)) else matriz_string(resultado)
-                        operando_str = operandos[i] if isinstance(operandos[i], (int, float)) else matriz_string(
-                            operandos[i])
-                        nuevo_resultado_str = nuevo_resultado if isinstance(nuevo_resultado,
-                                                                            (int, float)) else matriz_string(
-                            nuevo_resultado)
-
-                        pasos.append(f"{resultado_str}\n{simbolo_op}\n{operando_str}\n=\n{nuevo_resultado_str}\n")
-                        resultado = nuevo_resultado
-                    except ValueError as e:
-                        print(f"Error: {e}")
-                        break
+                try:
+                    resultado, explicacion, plan = multiplicar_cadena(operandos,
+                                                                      explicacion=nivel_explicacion_sesion)
 
-                # Mostrar los pasos y el resultado
-                if pasos:
-                    print("\nSOLUCIÓN PASO A PASO:")
-                    for paso in pasos:
+                    if nivel_explicacion_sesion == EXPLICACION_COMPLETA:
+                        print("\nSOLUCIÓN PASO A PASO:")
+                    # Mostrar la explicación a medida que se genera
+                    for paso in explicacion:
                         print(paso)
+
                     print("\nRESULTADO:")
-                    if isinstance(resultado, (int, float)):
+                    if _es_escalar(resultado):
                         print(resultado)
                     else:
                         print(matriz_string(resultado))
+                        _ofrecer_guardar(resultado)
+                except ValueError as e:
+                    print(f"Error: {e}")
 
             case '4':
                 matriz = input_matriz()
@@ -466,20 +3825,36 @@ def main():
                 matriz = input_matriz()
                 metodo = input("Desea usar adjuncion o gauss-jordan (responda con a o g respectivamente): ").lower()
                 try:
-                    inversa = calcular_inversa(matriz, metodo)
+                    inversa = calcular_inversa(matriz, metodo, nivel_explicacion_sesion)
                     print("La inversa de la matriz es:")
                     print(matriz_string(inversa))
+                    if backend_sesion == 'numpy':
+                        print(f"Número de condición: {numero_condicion(matriz)}")
+                    _ofrecer_guardar(inversa)
                 except ValueError as e:
                     print(f"Error: {e}")
 
             case '6':
                 matriz = input_matriz()
                 try:
-                    resultado = eliminar_gauss_jordan(matriz)
-                    print("\nSolución del sistema:")
-                    # Mostrar x_n resultantes
-                    for i in range(resultado['filas']):
-                        print(f"x_{i + 1} = {resultado['datos'][i][-1]}")
+                    analisis = analizar_sistema(matriz, nivel_explicacion_sesion)
+                    columnas_pivote = ', '.join(str(c + 1) for c in analisis['columnas_pivote']) or 'ninguna'
+                    print(f"\nRango de la matriz de coeficientes: {analisis['rango']} (columnas pivote: {columnas_pivote})")
+                    if not analisis['consistente']:
+                        print("El sistema es inconsistente: no tiene solución")
+                    else:
+                        base_nulo = analisis['base_nulo']
+                        if not base_nulo:
+                            print("Solución única del sistema:")
+                        else:
+                            print(f"El sistema tiene infinitas soluciones ({len(base_nulo)} variables libres).")
+                            print("Solución particular (variables libres en 0):")
+                        for i, x in enumerate(analisis['solucion_particular']):
+                            print(f"x_{i + 1} = {x}")
+                        if base_nulo:
+                            print("Base del espacio nulo (la solución general es la particular más una combinación de estos vectores):")
+                            for k, vector in enumerate(base_nulo):
+                                print(f"v_{k + 1} = ({', '.join(map(str, vector))})")
 
                 except ValueError as e:
                     print(f"Error: {e}")
@@ -493,44 +3868,123 @@ def main():
                 print("a b | c")
                 print("d e | f\n")
 
-                matriz_aumentada = input_matriz()
+                matriz_aumentada = a_densa(input_matriz())
 
                 try:
-                    soluciones, explicacion = resolver_cramer(matriz_aumentada)
+                    # Factorizar A una sola vez y reutilizarla para el determinante y la solución
+                    n = matriz_aumentada['filas']
+                    if matriz_aumentada['columnas'] != n + 1:
+                        raise ValueError("La matriz aumentada debe tener una columna más que filas")
+                    A_datos = [fila[:-1] for fila in matriz_aumentada['datos']]
+                    A = nueva_matriz(n, n, A_datos)
+                    if _obtener_backend(None) is None:
+                        factorizacion = factorizar_lu(A)
+                        det_A = factorizacion['determinante']
+                    else:
+                        factorizacion = None
+                        det_A = calcular_determinante(A)
 
                     print("\nSOLUCIÓN PASO A PASO:")
                     # Mostrar la matriz original
                     print("Matriz aumentada [A | b]:")
                     print(matriz_string(matriz_aumentada))
 
-                    # Extraer matriz A para calcular su determinante
-                    n = matriz_aumentada['filas']
-                    A_datos = [fila[:-1] for fila in matriz_aumentada['datos']]
-                    A = nueva_matriz(n, n, A_datos)
-
-                    det_A = calcular_determinante(A)
                     print(f"\nDeterminante de la matriz de coeficientes A: {det_A}")
+                    if backend_sesion == 'numpy':
+                        print(f"Número de condición de A: {numero_condicion(A)}")
 
                     if det_A == 0:
                         print("El sistema no tiene solución única porque el determinante de A es 0")
                     else:
+                        soluciones, explicacion = resolver_cramer(matriz_aumentada, factorizacion=factorizacion,
+                                                                  explicacion=nivel_explicacion_sesion)
+
                         print("\nCalculando cada incógnita:")
-                        for i in range(len(explicacion)):
-                            print(explicacion[i])
+                        for paso in explicacion:
+                            print(paso)
 
                         print("\nSolución del sistema:")
                         for i, sol in enumerate(soluciones):
                             print(f"x_{i + 1} = {sol}")
 
+                    if factorizacion is not None:
+                        _explorar_cambios(A, factorizacion, [fila[-1] for fila in matriz_aumentada['datos']])
+
                 except ValueError as e:
                     print(f"Error: {e}")
 
             case '8':
                 break
 
+            case '9':
+                menu_configuracion()
+
             case _:
                 print("Opción no válida. Intente de nuevo.")
 
 
+def ejecutar_desde_linea_de_comandos(argumentos=None):
+    parser = argparse.ArgumentParser(description="Calculadora de Álgebra Lineal")
+    parser.add_argument("--lote", metavar="ARCHIVO",
+                        help="procesa un archivo de trabajos JSON (uno por línea); use - para la entrada estándar")
+    parser.add_argument("--salida", metavar="ARCHIVO", help="archivo donde escribir los resultados del lote")
+    parser.add_argument("--procesos", type=int, help="cantidad de procesos trabajadores")
+    parser.add_argument("--tramo", type=int, default=64, help="trabajos enviados juntos a cada proceso")
+    parser.add_argument("--cache", metavar="ARCHIVO",
+                        help="archivo donde se conserva la caché de resultados entre sesiones")
+    parser.add_argument("--cache-mb", type=float, help="memoria máxima de la caché de resultados en MB")
+    parser.add_argument("--servidor", metavar="DIRECCION", nargs="?", const=DIRECCION_SERVIDOR,
+                        help="inicia el servidor JSON-RPC en host:puerto (solo localhost) o en un socket Unix "
+                             f"(unix:/ruta); por defecto {DIRECCION_SERVIDOR}")
+    parser.add_argument("--tiempo-maximo", type=float, default=TIEMPO_MAXIMO_SOLICITUD,
+                        help="segundos que puede tardar cada solicitud del servidor")
+    parser.add_argument("--datos", metavar="DIRECTORIO",
+                        help="directorio del que el servidor puede leer archivos de matrices; sin él, las "
+                             "solicitudes no pueden usar rutas")
+    parser.add_argument("--instrumentacion", metavar="ARCHIVO", nargs="?", const="",
+                        help="muestra contadores y tiempos tras cada operación del menú y, si se indica un "
+                             "archivo, los agrega en formato JSON (uno por línea)")
+    opciones = parser.parse_args(argumentos)
+
+    if opciones.instrumentacion is not None:
+        global instrumentacion_sesion, archivo_instrumentacion
+        instrumentacion_sesion = True
+        archivo_instrumentacion = opciones.instrumentacion or None
+
+    if opciones.cache_mb is not None:
+        configurar_cache(memoria_maxima=int(opciones.cache_mb * 2**20))
+    if opciones.cache is not None:
+        try:
+            configurar_cache(archivo=opciones.cache)
+        except ValueError as e:
+            # Una caché ilegible (por ejemplo, de una versión anterior) se descarta y se reescribe al salir
+            print(f"{e}; se empieza con la caché vacía", file=sys.stderr)
+
+    try:
+        if opciones.servidor is not None:
+            iniciar_servidor(opciones.servidor, opciones.procesos, opciones.tiempo_maximo,
+                             directorio_datos=opciones.datos)
+        elif opciones.lote is None:
+            main()
+        else:
+            _ejecutar_lote_desde_archivos(opciones)
+    finally:
+        # Con varios procesos cada trabajador tiene su propia caché; solo se conserva la del proceso principal
+        if opciones.cache is not None:
+            cache_resultados.guardar_archivo()
+
+
+def _ejecutar_lote_desde_archivos(opciones):
+    entrada = sys.stdin if opciones.lote == "-" else open(opciones.lote, encoding="utf-8")
+    salida = sys.stdout if opciones.salida is None else open(opciones.salida, "w", encoding="utf-8")
+    try:
+        ejecutar_lote(entrada, salida, opciones.procesos, opciones.tramo)
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    ejecutar_desde_linea_de_comandos()
\ No newline at end of file